@@ -1,26 +1,1908 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import requests
+import argparse
+import asyncio
+import atexit
+import bisect
+import cProfile
+import csv
+import io
+import itertools
 import json
+import pstats
+import queue
+import signal
+import sqlite3
 import time
+import tracemalloc
 import hmac
 import hashlib
+import heapq
 import threading
 import logging
+import logging.handlers
 import os
 import sys
 import random
+import numpy as np
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial, wraps
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from zoneinfo import ZoneInfo
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import shared_memory
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler, der erst im Listener-Thread formatiert"""
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.pid = os.getpid()
+    
+    def prepare(self, record):
+        return record
+
+class AccountLogAdapter(logging.LoggerAdapter):
+    """Stellt jeder Meldung den Kontonamen voran (mehrere Bots in einem Prozess)"""
+    def process(self, msg, kwargs):
+        return f"[{self.extra['account']}] {msg}", kwargs
+
+class JsonLinesFormatter(logging.Formatter):
+    """Kompaktes strukturiertes Log: eine JSON-Zeile pro Event"""
+    def format(self, record):
+        payload = {'ts': round(record.created, 3), 'event': record.getMessage()}
+        payload.update(getattr(record, 'fields', {}))
+        return json.dumps(payload, separators=(',', ':'), default=str)
+
+def has_log_listener(logger):
+    """Prüft auf einen aktiven Queue-Handler; geerbte aus einem fork() werden entfernt"""
+    for handler in [h for h in logger.handlers if isinstance(h, LazyQueueHandler)]:
+        if handler.pid == os.getpid():
+            return True
+        logger.removeHandler(handler)
+    return False
+
+def start_log_listener(logger, handlers, level):
+    """Hängt einen Queue-Handler an den Logger; Datei/Konsole schreibt ein Hintergrund-Thread"""
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(LazyQueueHandler(log_queue))
+    logger.setLevel(level)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+class SnapshotCache:
+    """Zwischenspeicher für Konto- und Positionsdaten mit TTL"""
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, loader):
+        """Liefert den gecachten Wert oder lädt ihn neu"""
+        value = self.peek(key)
+        if value is not None:
+            return value
+        
+        value = loader()
+        # Fehlgeschlagene Abfragen werden nicht gecacht
+        if value is not None:
+            self.put(key, value)
+        return value
+    
+    def peek(self, key):
+        """Liefert einen noch gültigen Wert ohne nachzuladen"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+        return None
+    
+    def put(self, key, value):
+        """Legt einen frischen Wert ab"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+    
+    def invalidate(self, key=None):
+        """Verwirft einen oder alle Einträge (z.B. nach einer Order)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+class QuoteCache:
+    """Letzte Bid/Ask-Kurse pro Epic - Lesezugriff ohne I/O und ohne Lock"""
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._quotes = {}
+        self._listeners = []
+    
+    def update(self, epic, bid, ask, timestamp=None):
+        """Übernimmt einen neuen Kurs und benachrichtigt Listener"""
+        quote = (bid, ask, self.clock() if timestamp is None else timestamp)
+        # Unveränderliches Tupel - der Austausch ist atomar
+        self._quotes[epic] = quote
+        for listener in self._listeners:
+            listener(epic, quote)
+    
+    def add_listener(self, listener):
+        """Registriert einen Callback listener(epic, (bid, ask, timestamp))"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+    
+    def get(self, epic):
+        return self._quotes.get(epic)
+    
+    def mid(self, epic):
+        quote = self._quotes.get(epic)
+        return (quote[0] + quote[1]) / 2 if quote else None
+    
+    def is_fresh(self, epic, max_age):
+        """Prüft ob ein Kurs vorhanden und nicht älter als max_age Sekunden ist"""
+        quote = self._quotes.get(epic)
+        return quote is not None and self.clock() - quote[2] <= max_age
+
+class FxRateCache:
+    """EUR/USD-Kurs aus dem Kurs-Stream oder per Abruf - Lesen ohne Lock, mit Alters-Prüfung"""
+    def __init__(self, epic, fallback_rate, max_age, clock=time.time):
+        self.epic = epic
+        self.max_age = max_age
+        self.clock = clock
+        # (Kurs, Zeitstempel) - Zeitstempel None = Startwert, noch nie aktualisiert
+        self._rate = (fallback_rate, None)
+    
+    def update(self, rate, timestamp=None):
+        # Unveränderliches Tupel - der Austausch ist atomar
+        self._rate = (rate, self.clock() if timestamp is None else timestamp)
+    
+    def on_quote(self, epic, quote):
+        """QuoteCache-Listener: übernimmt den Mittelkurs des FX-Epics"""
+        if epic == self.epic:
+            self.update((quote[0] + quote[1]) / 2, quote[2])
+    
+    @property
+    def rate(self):
+        """Letzter bekannter Kurs (auch wenn veraltet) - für Umrechnungen in Anzeige und Analyse"""
+        return self._rate[0]
+    
+    def age(self):
+        timestamp = self._rate[1]
+        return float('inf') if timestamp is None else self.clock() - timestamp
+    
+    def is_fresh(self):
+        """Nur mit frischem Kurs wird gehandelt"""
+        return self.age() <= self.max_age
+
+class CandleBuffer:
+    """Vorbelegter OHLCV-Ringpuffer eines Instruments mit fester Speichergröße"""
+    TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+    
+    def __init__(self, capacity, timeframe):
+        self.capacity = capacity
+        self.timeframe = timeframe
+        # Jede Kerze wird doppelt abgelegt (Slot i und i+capacity), damit die
+        # letzten n Kerzen immer zusammenhängend als View lesbar sind
+        self.data = np.full((2 * capacity, 6), np.nan)
+        self.next_slot = 0
+        self.count = 0
+        self.current = None
+    
+    def on_tick(self, timestamp, price, volume=1.0):
+        """Aggregiert einen Tick, liefert die abgeschlossene Kerze oder None"""
+        bucket = timestamp - timestamp % self.timeframe
+        bar = self.current
+        
+        if bar is None or bucket > bar[0]:
+            self.current = [bucket, price, price, price, price, volume]
+            if bar is not None:
+                self.append(bar)
+            return bar
+        
+        # Verspätete Ticks einer bereits abgeschlossenen Kerze ignorieren
+        if bucket == bar[0]:
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += volume
+        return None
+    
+    def append(self, bar):
+        """Schreibt eine abgeschlossene Kerze (überschreibt die älteste)"""
+        slot = self.next_slot
+        self.data[slot] = bar
+        self.data[slot + self.capacity] = bar
+        self.next_slot = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def window(self, n=None):
+        """Die letzten n abgeschlossenen Kerzen als View (ohne Kopie), älteste zuerst"""
+        n = self.count if n is None else min(n, self.count)
+        end = self.next_slot + self.capacity
+        return self.data[end - n:end]
+    
+    def closes(self, n=None):
+        return self.window(n)[:, self.CLOSE]
+    
+    def restore(self, bars, current=None):
+        """Übernimmt gespeicherte Kerzen (älteste zuerst) - auch bei geänderter Kapazität"""
+        bars = bars[-self.capacity:]
+        n = len(bars)
+        self.data[:n] = bars
+        self.data[self.capacity:self.capacity + n] = bars
+        self.next_slot = n % self.capacity
+        self.count = n
+        self.current = list(current) if current else None
+
+class CandleStore:
+    """Kerzen-Ringpuffer pro Epic, gespeist aus dem Kurs-Stream"""
+    def __init__(self, capacity, timeframe):
+        self.capacity = capacity
+        self.timeframe = timeframe
+        self.buffers = {}
+        self._listeners = []
+    
+    def buffer(self, epic):
+        buffer = self.buffers.get(epic)
+        if buffer is None:
+            buffer = self.buffers[epic] = CandleBuffer(self.capacity, self.timeframe)
+        return buffer
+    
+    def add_listener(self, listener):
+        """Registriert einen Callback listener(epic, bar) für abgeschlossene Kerzen"""
+        self._listeners.append(listener)
+    
+    def add_bar(self, epic, bar):
+        """Übernimmt eine fertige Kerze (z.B. aus historischen Daten)"""
+        self.buffer(epic).append(bar)
+        for listener in self._listeners:
+            listener(epic, bar)
+    
+    def on_quote(self, epic, quote):
+        """QuoteCache-Listener: Mittelkurs als Tick übernehmen"""
+        bid, ask, timestamp = quote
+        closed = self.buffer(epic).on_tick(timestamp, (bid + ask) / 2)
+        if closed is not None:
+            for listener in self._listeners:
+                listener(epic, closed)
+    
+    def window(self, epic, n=None):
+        return self.buffer(epic).window(n)
+    
+    def restore(self, epic, bars, current=None):
+        """Stellt den Puffer eines Epics wieder her und spielt die Kerzen an die Listener (Indikatoren)"""
+        buffer = self.buffer(epic)
+        buffer.restore(bars, current)
+        for bar in buffer.window().tolist():
+            for listener in self._listeners:
+                listener(epic, bar)
+
+class StreamingEMA:
+    """EMA mit O(1)-Update pro Wert (Start = erster Wert)"""
+    __slots__ = ('alpha', 'value', 'count')
+    
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.value = None
+        self.count = 0
+    
+    def update(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        self.count += 1
+        return self.value
+
+class StreamingRSI:
+    """Wilder-RSI mit O(1)-Update"""
+    __slots__ = ('gain', 'loss', 'prev')
+    
+    def __init__(self, period):
+        self.gain = StreamingEMA(1 / period)
+        self.loss = StreamingEMA(1 / period)
+        self.prev = None
+    
+    def update(self, close):
+        if self.prev is not None:
+            delta = close - self.prev
+            self.gain.update(max(delta, 0.0))
+            self.loss.update(max(-delta, 0.0))
+        self.prev = close
+        return self.value
+    
+    @property
+    def value(self):
+        if self.gain.value is None:
+            return 50.0
+        total = self.gain.value + self.loss.value
+        return 100 * self.gain.value / total if total > 0 else 50.0
+
+class StreamingATR:
+    """Average True Range (Wilder) mit O(1)-Update"""
+    __slots__ = ('ema', 'prev_close')
+    
+    def __init__(self, period):
+        self.ema = StreamingEMA(1 / period)
+        self.prev_close = None
+    
+    def update(self, high, low, close):
+        if self.prev_close is not None:
+            self.ema.update(max(high - low, abs(high - self.prev_close), abs(low - self.prev_close)))
+        self.prev_close = close
+        return self.value
+    
+    @property
+    def value(self):
+        return self.ema.value if self.ema.value is not None else 0.0
+
+class RollingStats:
+    """Gleitender Mittelwert/Varianz über ein festes Fenster (Welford mit Entfernen)"""
+    __slots__ = ('window', 'values', 'index', 'count', 'mean', 'm2')
+    
+    def __init__(self, window):
+        self.window = window
+        self.values = [0.0] * window
+        self.index = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, x):
+        if self.count < self.window:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            # Ältesten Wert durch den neuen ersetzen
+            old = self.values[self.index]
+            old_mean = self.mean
+            self.mean += (x - old) / self.window
+            self.m2 += (x - old) * (x - self.mean + old - old_mean)
+        self.values[self.index] = x
+        self.index = (self.index + 1) % self.window
+    
+    @property
+    def variance(self):
+        return max(self.m2, 0.0) / (self.count - 1) if self.count > 1 else 0.0
+
+class IndicatorSet:
+    """Laufende Indikatoren eines Instruments - Zustand bleibt zwischen den Zyklen erhalten"""
+    def __init__(self, ema_fast, ema_slow, rsi_period, atr_period, window):
+        self.ema_fast = StreamingEMA(2 / (ema_fast + 1))
+        self.ema_slow = StreamingEMA(2 / (ema_slow + 1))
+        self.rsi = StreamingRSI(rsi_period)
+        self.atr = StreamingATR(atr_period)
+        self.stats = RollingStats(window)
+        self.count = 0
+    
+    def update(self, bar):
+        """Übernimmt eine abgeschlossene Kerze [timestamp, open, high, low, close, volume]"""
+        close = bar[CandleBuffer.CLOSE]
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        self.rsi.update(close)
+        self.atr.update(bar[CandleBuffer.HIGH], bar[CandleBuffer.LOW], close)
+        self.stats.update(close)
+        self.count += 1
+    
+    def features(self):
+        """Merkmale in der Reihenfolge von SignalEngine.features"""
+        return self.ema_fast.value, self.ema_slow.value, self.rsi.value, self.atr.value
+
+class IndicatorStore:
+    """Laufende Indikatoren pro Epic, gespeist aus abgeschlossenen Kerzen"""
+    def __init__(self, ema_fast, ema_slow, rsi_period, atr_period, window):
+        self.params = (ema_fast, ema_slow, rsi_period, atr_period, window)
+        self.sets = {}
+    
+    def on_bar(self, epic, bar):
+        """CandleStore-Listener"""
+        indicators = self.sets.get(epic)
+        if indicators is None:
+            indicators = self.sets[epic] = IndicatorSet(*self.params)
+        indicators.update(bar)
+    
+    def get(self, epic):
+        return self.sets.get(epic)
+
+class HeuristicSignalModel:
+    """Standardmodell: Trend-Score aus EMA-Abstand (in ATR) und RSI-Momentum"""
+    name = 'heuristic'
+    
+    def predict(self, inputs):
+        trend, _, rsi, _ = inputs.T
+        return np.clip(0.5 + 0.25 * np.tanh(trend) + 0.25 * (2 * rsi - 1), 0, 1)
+
+class NumpySignalModel:
+    """Kleines MLP aus einer .npz-Datei: W0, b0, W1, b1, ... (tanh, Ausgang sigmoid), optional mean/std"""
+    name = 'numpy'
+    
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.layers = []
+            while f'W{len(self.layers)}' in data:
+                i = len(self.layers)
+                self.layers.append((data[f'W{i}'], data[f'b{i}']))
+            self.mean = data['mean'] if 'mean' in data else 0.0
+            self.std = data['std'] if 'std' in data else 1.0
+        if not self.layers:
+            raise ValueError(f"Keine Gewichte (W0, b0, ...) in {path}")
+    
+    def predict(self, inputs):
+        x = (inputs - self.mean) / self.std
+        for weights, bias in self.layers[:-1]:
+            x = np.tanh(x @ weights + bias)
+        weights, bias = self.layers[-1]
+        return 1 / (1 + np.exp(-(x @ weights + bias).reshape(len(inputs))))
+
+class SklearnSignalModel:
+    """Serialisiertes scikit-learn-Modell (.joblib/.pkl, benötigt scikit-learn) - Score = P(Klasse 1)"""
+    name = 'sklearn'
+    
+    def __init__(self, path):
+        import joblib
+        self.model = joblib.load(path)
+    
+    def predict(self, inputs):
+        if hasattr(self.model, 'predict_proba'):
+            return self.model.predict_proba(inputs)[:, -1]
+        return np.clip(self.model.predict(inputs), 0, 1)
+
+class OnnxSignalModel:
+    """ONNX-Modell auf der CPU (benötigt onnxruntime) - erster Ausgang, bei zwei Spalten P(Klasse 1)"""
+    name = 'onnx'
+    
+    def __init__(self, path):
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        # Klassifikatoren aus skl2onnx liefern Labels und Wahrscheinlichkeiten - wir wollen letztere
+        outputs = self.session.get_outputs()
+        self.output_name = outputs[-1].name if len(outputs) > 1 else outputs[0].name
+    
+    def predict(self, inputs):
+        output = self.session.run([self.output_name], {self.input_name: inputs.astype(np.float32)})[0]
+        if isinstance(output, list):
+            # ZipMap: Liste von {Klasse: Wahrscheinlichkeit}
+            return np.array([row[max(row)] for row in output])
+        output = np.asarray(output, dtype=float)
+        return output[:, -1] if output.ndim == 2 else output.reshape(len(inputs))
+
+def load_signal_model(path):
+    """Lädt das Signalmodell einmalig beim Start (leer = Heuristik)"""
+    if not path:
+        return HeuristicSignalModel()
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npz':
+        return NumpySignalModel(path)
+    if extension in ('.joblib', '.pkl'):
+        return SklearnSignalModel(path)
+    if extension == '.onnx':
+        return OnnxSignalModel(path)
+    raise ValueError(f"Unbekanntes Modellformat: {path}")
+
+class SignalEngine:
+    """Vektorisierte Indikatoren und Signalregeln für alle Assets in einem NumPy-Durchlauf"""
+    REASONS = {
+        'crypto': {'BUY': "Bullisches Momentum erkannt", 'SELL': "Bearisches Momentum erkannt", 'HOLD': "Seitwärtsmarkt - abwarten"},
+        'commodity': {'BUY': "Stabile Aufwärtstrend bei Rohstoffen", 'SELL': "Abwärtstrend bei Rohstoffen", 'HOLD': "Stabile Seitwärtsphase"}
+    }
+    
+    def __init__(self, ema_fast=12, ema_slow=26, rsi_period=14, atr_period=14, model=None, metrics=None):
+        self.ema_fast = ema_fast
+        self.ema_slow = ema_slow
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.model = model or HeuristicSignalModel()
+        self.metrics = metrics
+        self._weights = {}
+        # Schlüssel (Epic) → (Eingabevektor, Score) - unveränderte Features ohne neue Inferenz
+        self._memo = {}
+    
+    def ema_weights(self, alpha, length):
+        """Gewichte, mit denen ein Skalarprodukt den letzten EMA-Wert liefert (Start = erster Wert)"""
+        key = (alpha, length)
+        weights = self._weights.get(key)
+        if weights is None:
+            age = np.arange(length - 1, -1, -1)
+            weights = alpha * (1 - alpha) ** age
+            weights[0] = (1 - alpha) ** (length - 1)
+            weights = self._weights[key] = weights
+        return weights
+    
+    def features(self, bars):
+        """Berechnet EMA/RSI/ATR aus einer Assets×Zeit×OHLCV-Matrix"""
+        high = bars[:, :, CandleBuffer.HIGH]
+        low = bars[:, :, CandleBuffer.LOW]
+        close = bars[:, :, CandleBuffer.CLOSE]
+        length = close.shape[1]
+        
+        ema_fast = close @ self.ema_weights(2 / (self.ema_fast + 1), length)
+        ema_slow = close @ self.ema_weights(2 / (self.ema_slow + 1), length)
+        
+        # Wilder-RSI und ATR sind EMAs mit alpha = 1/Periode
+        delta = np.diff(close, axis=1)
+        rsi_weights = self.ema_weights(1 / self.rsi_period, length - 1)
+        avg_gain = np.clip(delta, 0, None) @ rsi_weights
+        avg_loss = np.clip(-delta, 0, None) @ rsi_weights
+        total = avg_gain + avg_loss
+        rsi = np.where(total > 0, 100 * avg_gain / np.where(total > 0, total, 1), 50.0)
+        
+        prev_close = close[:, :-1]
+        true_range = np.maximum(high[:, 1:] - low[:, 1:],
+                                np.maximum(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)))
+        atr = true_range @ self.ema_weights(1 / self.atr_period, length - 1)
+        
+        return np.column_stack([ema_fast, ema_slow, rsi, atr])
+    
+    @staticmethod
+    def model_inputs(features):
+        """Skalenfreie Modell-Eingaben: [EMA-Abstand in ATR, EMA-Abstand relativ, RSI/100, ATR relativ]"""
+        ema_fast, ema_slow, rsi, atr = features.T
+        trend = np.divide(ema_fast - ema_slow, atr, out=np.zeros_like(atr), where=atr > 0)
+        spread = np.divide(ema_fast, ema_slow, out=np.ones_like(ema_slow), where=ema_slow != 0) - 1
+        volatility = np.divide(atr, ema_slow, out=np.zeros_like(atr), where=ema_slow != 0)
+        return np.column_stack([trend, spread, rsi / 100, volatility])
+    
+    def scores(self, features, keys=None):
+        """Score 0..1 (>0.5 bullisch) für alle Assets in einem Modellaufruf, mit Cache pro Schlüssel"""
+        inputs = self.model_inputs(features)
+        if keys is None:
+            return self._predict(inputs)
+        
+        rows = [row.tobytes() for row in inputs]
+        scores = np.empty(len(inputs))
+        todo = []
+        for i, key in enumerate(keys):
+            cached = self._memo.get(key)
+            if cached is not None and cached[0] == rows[i]:
+                scores[i] = cached[1]
+            else:
+                todo.append(i)
+        
+        if todo:
+            fresh = self._predict(inputs[todo])
+            for i, score in zip(todo, fresh.tolist()):
+                scores[i] = score
+                self._memo[keys[i]] = (rows[i], score)
+        if self.metrics:
+            self.metrics.inc('inference_cache_hits_total', len(inputs) - len(todo))
+        return scores
+    
+    def _predict(self, inputs):
+        started = time.perf_counter()
+        scores = np.asarray(self.model.predict(inputs), dtype=float)
+        if self.metrics:
+            self.metrics.observe('inference_seconds', time.perf_counter() - started, model=self.model.name)
+            self.metrics.inc('inference_rows_total', len(inputs), model=self.model.name)
+        return scores
+    
+    @staticmethod
+    def directions(types, scores):
+        """BUY-/SELL-Masken - Rohstoffe mit konservativeren Schwellen (ein Typ gilt für alle Scores)"""
+        is_crypto = np.array([t == 'crypto' for t in types])
+        buy = scores > np.where(is_crypto, 0.6, 0.65)
+        sell = scores < np.where(is_crypto, 0.4, 0.35)
+        return is_crypto, buy, sell
+    
+    def signals(self, types, prices, scores, stop_loss_percent, take_profit_percent):
+        """Wendet die Krypto-/Rohstoff-Schwellen als Masken an"""
+        is_crypto, buy, sell = self.directions(types, scores)
+        prices = np.asarray(prices, dtype=float)
+        
+        # Rohstoffe: engere Stops
+        scale = np.where(is_crypto, 1.0, 0.8)
+        side = np.where(buy, 1.0, np.where(sell, -1.0, 0.0))
+        
+        stop_loss = np.round(prices * (1 - side * stop_loss_percent * scale), 4)
+        take_profit = np.round(prices * (1 + side * take_profit_percent * scale), 4)
+        confidence = np.round(np.where(buy, scores, np.where(sell, 1 - scores, 0.5)), 2)
+        
+        results = []
+        for i, asset_type in enumerate(types):
+            direction = 'BUY' if buy[i] else 'SELL' if sell[i] else 'HOLD'
+            results.append({
+                'direction': direction,
+                'stop_loss': float(stop_loss[i]),
+                'take_profit': float(take_profit[i]),
+                'confidence': float(confidence[i]),
+                'reason': self.REASONS.get(asset_type, self.REASONS['commodity'])[direction]
+            })
+        return results
+
+class RestQuoteTransport:
+    """Kurs-Transport per gebündeltem REST-Polling (/markets?epics=...)"""
+    def __init__(self, bot, epics, interval):
+        self.bot = bot
+        self.epics = list(epics)
+        self.interval = interval
+    
+    def run(self, cache, stop_event):
+        endpoint = "/markets?epics=" + ",".join(self.epics)
+        while not stop_event.is_set():
+            response = self.bot.api_request("GET", endpoint) or {}
+            for market in response.get('marketDetails', response.get('markets', [])):
+                epic = market.get('instrument', {}).get('epic', market.get('epic'))
+                snapshot = market.get('snapshot', market)
+                if epic and snapshot.get('bid') and snapshot.get('offer'):
+                    cache.update(epic, snapshot['bid'], snapshot['offer'])
+            stop_event.wait(self.interval)
+
+class WebSocketQuoteTransport:
+    """Kurs-Transport über den Streaming-WebSocket (benötigt websocket-client)"""
+    def __init__(self, bot, epics, url):
+        self.bot = bot
+        self.epics = list(epics)
+        self.url = url
+    
+    def run(self, cache, stop_event):
+        import websocket
+        
+        timestamp, signature = self.bot.generate_signature("GET", "/connect")
+        ws = websocket.create_connection(self.url, timeout=10)
+        try:
+            ws.send(json.dumps({
+                "destination": "marketData.subscribe",
+                "correlationId": timestamp,
+                "cst": self.bot.api_key,
+                "securityToken": signature,
+                "payload": {"epics": self.epics}
+            }))
+            while not stop_event.is_set():
+                try:
+                    message = json.loads(ws.recv())
+                except websocket.WebSocketTimeoutException:
+                    ws.send(json.dumps({"destination": "ping", "correlationId": timestamp}))
+                    continue
+                payload = message.get('payload') or {}
+                if message.get('destination') == 'quote' and 'epic' in payload:
+                    cache.update(payload['epic'], payload['bid'], payload.get('ofr', payload.get('ask')))
+        finally:
+            ws.close()
+
+class ReplayQuoteTransport:
+    """Kurs-Transport aus einer Datei (CSV: timestamp,epic,bid,ask) als Ersatz für den Stream"""
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+    
+    def run(self, cache, stop_event):
+        last_timestamp = None
+        with open(self.path) as f:
+            for line in f:
+                if stop_event.is_set():
+                    break
+                parts = line.strip().split(',')
+                if len(parts) < 4 or parts[0] == 'timestamp':
+                    continue
+                timestamp, epic, bid, ask = float(parts[0]), parts[1], float(parts[2]), float(parts[3])
+                
+                # Zeitabstände der Aufzeichnung nachbilden (speed=0: so schnell wie möglich)
+                if last_timestamp is not None and self.speed > 0:
+                    stop_event.wait(max(0, timestamp - last_timestamp) / self.speed)
+                last_timestamp = timestamp
+                cache.update(epic, bid, ask)
+        
+        # Nach dem Ende der Aufzeichnung nicht neu starten
+        stop_event.wait()
+
+class QuoteFeed:
+    """Betreibt einen Kurs-Transport im Hintergrund und hält den QuoteCache aktuell"""
+    def __init__(self, transport, cache, logger, retry_delay=5):
+        self.transport = transport
+        self.cache = cache
+        self.logger = logger
+        self.retry_delay = retry_delay
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='quote-feed', daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.transport.run(self.cache, self.stop_event)
+            except Exception as e:
+                self.logger.error(f"❌ Kurs-Feed unterbrochen: {str(e)}")
+                self.stop_event.wait(self.retry_delay)
+    
+    def stop(self):
+        self.stop_event.set()
+
+class RequestScheduler:
+    """Zentrale Request-Steuerung: Token-Bucket, Order-Priorität, Retry mit Backoff und GET-Coalescing"""
+    PRIORITY_ORDER = 0
+    PRIORITY_INFO = 1
+    IDEMPOTENT = ("GET", "DELETE")
+    
+    def __init__(self, send, logger, rate=10.0, burst=10, max_retries=3, backoff_base=0.5, backoff_max=8.0):
+        self.send = send
+        self.logger = logger
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._sequence = 0
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, priority):
+        """Wartet auf ein Token - Orders werden vor Abfragen bedient"""
+        with self._condition:
+            self._sequence += 1
+            ticket = (priority, self._sequence)
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                self._refill()
+                if self._waiting[0] == ticket and self._tokens >= 1:
+                    heapq.heappop(self._waiting)
+                    self._tokens -= 1
+                    self._condition.notify_all()
+                    return
+                timeout = (1 - self._tokens) / self.rate if self._waiting[0] == ticket else None
+                self._condition.wait(timeout)
+    
+    def throttle(self, seconds):
+        """Leert den Bucket nach einem 429, damit alle Aufrufer bremsen"""
+        with self._condition:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+    
+    @staticmethod
+    def parse_retry_after(value):
+        """Retry-After in Sekunden oder als HTTP-Datum - None wenn fehlend oder unlesbar"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError):
+            return None
+    
+    def request(self, method, endpoint, data=None):
+        """Führt einen Request aus (None bei Fehlern wie api_request)"""
+        if method != "GET":
+            return self._execute(method, endpoint, data)
+        
+        # Identische GETs teilen sich eine laufende Antwort
+        with self._inflight_lock:
+            future = self._inflight.get(endpoint)
+            owner = future is None
+            if owner:
+                future = self._inflight[endpoint] = Future()
+        if not owner:
+            return future.result()
+        
+        result = None
+        try:
+            result = self._execute(method, endpoint, data)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[endpoint]
+            future.set_result(result)
+        return result
+    
+    def _execute(self, method, endpoint, data):
+        priority = self.PRIORITY_INFO if method == "GET" else self.PRIORITY_ORDER
+        attempts = self.max_retries + 1 if method in self.IDEMPOTENT else 1
+        
+        for attempt in range(attempts):
+            self.acquire(priority)
+            retry_after = None
+            try:
+                response = self.send(method, endpoint, data)
+            except Exception as e:
+                error = f"❌ API request failed: {str(e)}"
+            else:
+                if response.status_code == 200:
+                    # Proxy- oder Wartungsseiten kommen mit 200, aber ohne JSON
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        error = f"❌ Invalid API response: {str(e)}"
+                else:
+                    error = f"❌ API Error {response.status_code}: {response.text}"
+                if response.status_code == 429:
+                    retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+                    self.throttle(retry_after if retry_after is not None else min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                elif response.status_code < 500:
+                    self.logger.error(error)
+                    return None
+            
+            if attempt + 1 < attempts:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.5)
+                self.logger.warning("%s - Wiederholung %d/%d in %.1fs", error, attempt + 1, attempts - 1, delay)
+                time.sleep(max(delay, retry_after or 0))
+        
+        self.logger.error(error)
+        return None
+
+class PositionReconciler:
+    """Gleicht Broker-Positionen per Diff ab und meldet Änderungen als Events"""
+    TRACKED_FIELDS = ('deal_id', 'direction', 'size', 'open_level', 'stop_level', 'limit_level')
+    
+    def __init__(self, positions, epic_index):
+        self.positions = positions
+        self.epic_index = epic_index
+        self._last_raw = None
+        self._listeners = []
+    
+    def add_listener(self, listener):
+        """Registriert einen Callback listener(event, asset, position) für opened/closed/changed"""
+        self._listeners.append(listener)
+    
+    @staticmethod
+    def convert(raw):
+        details = raw.get('position', {})
+        return {
+            'deal_id': details.get('dealId'),
+            'epic': raw.get('epic', raw.get('market', {}).get('epic', 'Unknown')),
+            'direction': details.get('direction', 'UNKNOWN'),
+            'size': details.get('size', 0),
+            'profit': details.get('profit', 0),
+            'open_level': details.get('openLevel', 0),
+            'stop_level': details.get('stopLevel'),
+            'limit_level': details.get('limitLevel')
+        }
+    
+    def reconcile(self, raw_positions):
+        """Wendet nur eröffnete, geschlossene und geänderte Positionen an"""
+        # Unveränderter Snapshot - nichts zu tun
+        if raw_positions is self._last_raw:
+            return []
+        self._last_raw = raw_positions
+        
+        current = {}
+        for raw in raw_positions:
+            position = self.convert(raw)
+            asset = self.epic_index.get(position['epic'])
+            if position['deal_id'] and asset:
+                current[asset] = position
+        
+        events = []
+        for asset in [a for a in self.positions if a not in current]:
+            events.append(('closed', asset, self.positions.pop(asset)))
+        
+        for asset, position in current.items():
+            known = self.positions.get(asset)
+            if known is None:
+                self.positions[asset] = position
+                events.append(('opened', asset, position))
+            elif known['deal_id'] != position['deal_id']:
+                events.append(('closed', asset, known))
+                self.positions[asset] = position
+                events.append(('opened', asset, position))
+            elif any(known.get(field) != position[field] for field in self.TRACKED_FIELDS):
+                known.update(position)
+                events.append(('changed', asset, known))
+            else:
+                # Nur der laufende P&L - ohne Event
+                known['profit'] = position['profit']
+        
+        for event in events:
+            for listener in self._listeners:
+                listener(*event)
+        return events
+
+class TradeJournal:
+    """Persistentes Trade-Journal (SQLite im WAL-Modus) - Schreiben im Hintergrund-Thread"""
+    COLUMNS = ('timestamp', 'asset', 'direction', 'size', 'price', 'stop_loss', 'take_profit',
+               'deal_reference', 'deal_id', 'deal_status', 'leverage')
+    
+    def __init__(self, path, logger):
+        self.path = path
+        self.logger = logger
+        self.total = 0
+        self.queue = None
+        self.thread = None
+        if not path:
+            return
+        
+        with self._connect() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS trades (id INTEGER PRIMARY KEY, {', '.join(self.COLUMNS)})")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_asset_time ON trades (asset, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_time ON trades (timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_reference ON trades (deal_reference)")
+            self.total = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+        
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._writer, name='trade-journal', daemon=True)
+        self.thread.start()
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def record(self, trade):
+        """Reiht einen Fill zum Schreiben ein (blockiert den Trading-Thread nicht)"""
+        self.total += 1
+        if self.queue:
+            row = dict(trade, timestamp=trade['timestamp'].timestamp())
+            self.queue.put(('insert', tuple(row.get(column) for column in self.COLUMNS)))
+    
+    def update_deal(self, deal_reference, deal_id, deal_status):
+        if self.queue:
+            self.queue.put(('update', (deal_id, deal_status, deal_reference)))
+    
+    def _writer(self):
+        conn = self._connect()
+        insert = f"INSERT INTO trades ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})"
+        update = "UPDATE trades SET deal_id = ?, deal_status = ? WHERE deal_reference = ?"
+        
+        while True:
+            items = [self.queue.get()]
+            # Alles Wartende in einer Transaktion schreiben
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                with conn:
+                    for kind, params in items:
+                        if kind == 'insert':
+                            conn.execute(insert, params)
+                        elif kind == 'update':
+                            conn.execute(update, params)
+            except Exception as e:
+                self.logger.error(f"❌ Trade-Journal Schreibfehler: {str(e)}")
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+            
+            if any(kind == 'close' for kind, _ in items):
+                conn.close()
+                return
+    
+    def query(self, asset=None, start=None, end=None, limit=None):
+        """Trades nach Asset und Zeitraum (datetime), neueste zuletzt"""
+        if not self.path:
+            return []
+        
+        conditions, params = [], []
+        if asset:
+            conditions.append("asset = ?")
+            params.append(asset)
+        if start:
+            conditions.append("timestamp >= ?")
+            params.append(start.timestamp())
+        if end:
+            conditions.append("timestamp < ?")
+            params.append(end.timestamp())
+        
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM trades"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        
+        trades = [dict(zip(self.COLUMNS, row)) for row in reversed(rows)]
+        for trade in trades:
+            trade['timestamp'] = datetime.fromtimestamp(trade['timestamp'])
+        return trades
+    
+    def flush(self):
+        if self.queue:
+            self.queue.join()
+    
+    def close(self):
+        if self.queue:
+            self.queue.put(('close', None))
+            self.thread.join(timeout=10)
+            self.queue = None
+
+class InstrumentStore:
+    """Instrument-Stammdaten (Mindestgröße, Schrittweite, Margin, Handelszeiten) mit Platten-Cache und TTL"""
+    WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+    
+    def __init__(self, path, ttl, logger):
+        self.path = path
+        self.ttl = ttl
+        self.logger = logger
+        self._instruments = {}
+        self._decimals = {}
+        if path:
+            self._read()
+    
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                self._instruments = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning("⚠️ Instrument-Cache nicht lesbar: %s", e)
+    
+    def _write(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._instruments, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+    
+    def get(self, epic):
+        return self._instruments.get(epic)
+    
+    def missing(self, epics):
+        """Epics ohne oder mit abgelaufenen Stammdaten"""
+        now = time.time()
+        return [epic for epic in epics
+                if epic not in self._instruments or now - self._instruments[epic]['fetched_at'] > self.ttl]
+    
+    def refresh(self, fetch, epics, force=False):
+        """Lädt fehlende/abgelaufene Epics mit einem Aufruf fetch(epics) → Liste von Market-Details"""
+        stale = list(epics) if force else self.missing(epics)
+        if not stale:
+            return 0
+        
+        markets = fetch(stale)
+        if markets is None:
+            # Abgelaufene Einträge bleiben nutzbar, bis der nächste Abruf klappt
+            self.logger.warning("⚠️ Instrument-Daten konnten nicht geladen werden: %s", ", ".join(stale))
+            return 0
+        
+        # Neues dict statt Änderung in-place - Leser sehen immer einen vollständigen Stand
+        instruments = dict(self._instruments)
+        for market in markets:
+            entry = self.parse(market)
+            if entry['epic']:
+                instruments[entry['epic']] = entry
+        self._instruments = instruments
+        
+        if self.path:
+            try:
+                self._write()
+            except Exception as e:
+                self.logger.warning("⚠️ Instrument-Cache nicht gespeichert: %s", e)
+        self.logger.info("📐 Instrument-Daten geladen: %d Epics", len(markets))
+        return len(markets)
+    
+    @staticmethod
+    def parse(market):
+        """Market-Details (/markets/{epic}) → kompakter Eintrag"""
+        instrument = market.get('instrument', {})
+        rules = market.get('dealingRules', {})
+        
+        def rule(name):
+            value = (rules.get(name) or {}).get('value')
+            return float(value) if value is not None else None
+        
+        margin_factor = instrument.get('marginFactor')
+        if margin_factor is not None and instrument.get('marginFactorUnit', 'PERCENTAGE') == 'PERCENTAGE':
+            margin_factor = margin_factor / 100
+        
+        return {
+            'epic': instrument.get('epic', market.get('epic')),
+            'min_size': rule('minDealSize'),
+            'max_size': rule('maxDealSize'),
+            'size_step': rule('minSizeIncrement'),
+            'margin_factor': margin_factor,
+            'opening_hours': instrument.get('openingHours'),
+            'fetched_at': time.time()
+        }
+    
+    def round_size(self, epic, size, fallback_step):
+        """Rundet auf die Schrittweite des Brokers ab, mindestens die Mindestgröße"""
+        entry = self._instruments.get(epic) or {}
+        step = entry.get('size_step') or fallback_step
+        min_size = entry.get('min_size') or step
+        
+        if step > 0:
+            # Toleranz gegen Fließkomma-Fehler (0.3 / 0.1 = 2.9999...)
+            size = (size / step + 1e-9) // 1 * step
+            decimals = self._decimals.get(step)
+            if decimals is None:
+                decimals = self._decimals[step] = max(0, 2 - int(np.floor(np.log10(step))))
+            size = round(size, decimals)
+        size = max(min_size, size)
+        if entry.get('max_size'):
+            size = min(size, entry['max_size'])
+        return size
+    
+    def max_leverage(self, epic):
+        """Maximal erlaubter Hebel aus dem Margin-Faktor (None = unbekannt)"""
+        margin_factor = (self._instruments.get(epic) or {}).get('margin_factor')
+        return 1 / margin_factor if margin_factor else None
+    
+    def is_open(self, epic, timestamp):
+        """Prüft die Handelszeiten - ohne Angaben gilt der Markt als offen"""
+        hours = (self._instruments.get(epic) or {}).get('opening_hours')
+        if not hours:
+            return True
+        
+        now = datetime.fromtimestamp(timestamp, ZoneInfo(hours.get('zone', 'UTC')))
+        current = now.strftime('%H:%M')
+        for period in hours.get(self.WEEKDAYS[now.weekday()], []):
+            start, end = (part.strip() for part in period.split('-'))
+            # "22:05 - 00:00" endet um Mitternacht, "22:00 - 02:00" läuft über sie hinweg
+            if end == '00:00':
+                end = '24:00'
+            if start <= end:
+                if start <= current <= end:
+                    return True
+            elif current >= start or current <= end:
+                return True
+        return False
+
+class ExitEngine:
+    """Client-seitige Exits pro Tick: Trailing-Stop, Break-Even und Haltedauer in einem Array pro Position"""
+    SIGN, OPEN, STOP, BEST, OPENED_AT, RETRY_AT = range(6)
+    RETRY_DELAY = 5.0
+    
+    def __init__(self, close, logger, trailing_percent=0.0, break_even_percent=0.0, max_hold_seconds=0.0, clock=time.time, capacity=8):
+        self.close = close
+        self.logger = logger
+        self.trailing_percent = trailing_percent
+        self.break_even_percent = break_even_percent
+        self.max_hold_seconds = max_hold_seconds
+        self.clock = clock
+        
+        self.state = np.full((capacity, 6), np.nan)
+        self.slots = {}
+        self.positions = [None] * capacity
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self):
+        return bool(self.trailing_percent or self.break_even_percent or self.max_hold_seconds)
+    
+    def track(self, asset, position, best=None, stop=None, opened_at=None):
+        """Übernimmt eine Position (Reconciler-Event 'opened' oder Warmstart)"""
+        with self._lock:
+            slot = self.slots.get(position['epic'])
+            if slot is None:
+                free = [i for i, entry in enumerate(self.positions) if entry is None]
+                if not free:
+                    # Kapazität verdoppeln - selten, Zeilen bleiben an ihrer Stelle
+                    free = [len(self.positions)]
+                    self.state = np.vstack([self.state, np.full(self.state.shape, np.nan)])
+                    self.positions.extend([None] * len(self.positions))
+                slot = free[0]
+            
+            sign = 1.0 if position['direction'] == 'BUY' else -1.0
+            broker_stop = position.get('stop_level')
+            self.state[slot] = (
+                sign,
+                position['open_level'],
+                stop if stop is not None else (broker_stop if broker_stop else -sign * np.inf),
+                best if best is not None else position['open_level'],
+                opened_at if opened_at is not None else self.clock(),
+                0.0
+            )
+            self.positions[slot] = (asset, position['deal_id'], position['epic'])
+            self.slots[position['epic']] = slot
+    
+    def untrack(self, epic):
+        with self._lock:
+            slot = self.slots.pop(epic, None)
+            if slot is not None:
+                self.positions[slot] = None
+                self.state[slot] = np.nan
+    
+    def on_position_event(self, event, asset, position):
+        """PositionReconciler-Listener"""
+        if event == 'closed':
+            self.untrack(position['epic'])
+        elif event == 'opened':
+            self.track(asset, position)
+        else:
+            # Geänderter Broker-Stop zählt nur, wenn er enger ist
+            with self._lock:
+                slot = self.slots.get(position['epic'])
+                if slot is not None and position.get('stop_level'):
+                    row = self.state[slot]
+                    if row[self.SIGN] * (position['stop_level'] - row[self.STOP]) > 0:
+                        row[self.STOP] = position['stop_level']
+    
+    def on_quote(self, epic, quote):
+        """QuoteCache-Listener: Stops nachziehen und bei Auslösung schließen"""
+        with self._lock:
+            # Slots werden wiederverwendet - die Zeile muss noch zu diesem Epic gehören
+            slot = self.slots.get(epic)
+            entry = self.positions[slot] if slot is not None else None
+            if entry is None or entry[2] != epic:
+                return
+            sign, open_level, stop, best, opened_at, retry_at = self.state[slot].tolist()
+            now = quote[2]
+            if now < retry_at:
+                return
+            
+            # Long schließt zum Bid, Short zum Ask
+            price = quote[0] if sign > 0 else quote[1]
+            if sign * (price - best) > 0:
+                best = price
+            
+            reason = None
+            if self.break_even_percent and sign * (best - open_level) >= open_level * self.break_even_percent and sign * (open_level - stop) > 0:
+                stop = open_level
+            trail = None
+            if self.trailing_percent:
+                trail = best * (1 - sign * self.trailing_percent)
+                if sign * (trail - stop) > 0:
+                    stop = trail
+            if sign * (price - stop) <= 0:
+                # Benannt nach der Regel, die den Stop zuletzt gesetzt hat
+                if stop == trail:
+                    reason = 'Trailing-Stop'
+                elif self.break_even_percent and stop == open_level:
+                    reason = 'Break-Even'
+                else:
+                    reason = 'Stop-Loss'
+            elif self.max_hold_seconds and now - opened_at >= self.max_hold_seconds:
+                reason = 'Haltedauer'
+            
+            row = self.state[slot]
+            row[self.STOP] = stop
+            row[self.BEST] = best
+            if reason is None:
+                return
+            # Kein zweiter Close, bis der erste beantwortet ist oder fehlschlägt
+            row[self.RETRY_AT] = now + self.RETRY_DELAY
+        
+        asset, deal_id, _ = entry
+        self.logger.info("🚪 Exit %s (%s): Kurs %.4f | Stop %.4f", asset, reason, price, stop)
+        self.close(asset, deal_id, reason)
+    
+    def export(self):
+        """Exit-Zustand pro Asset für den Warmstart-Snapshot"""
+        with self._lock:
+            return {
+                entry[0]: {'best': self.state[slot, self.BEST], 'stop': self.state[slot, self.STOP], 'opened_at': self.state[slot, self.OPENED_AT]}
+                for slot, entry in enumerate(self.positions) if entry is not None
+            }
+
+class StateStore:
+    """Atomarer Laufzeit-Snapshot: Zustand als JSON, Kerzen als .npy (beim Laden memory-mapped)"""
+    VERSION = 1
+    
+    def __init__(self, directory, logger):
+        self.directory = directory
+        self.logger = logger
+        self.path = os.path.join(directory, 'state.json')
+    
+    def save(self, state, candles):
+        """state: JSON-fähiges dict, candles: epic → (Kerzen-Array, laufende Kerze)"""
+        os.makedirs(self.directory, exist_ok=True)
+        
+        # Alle Kerzen in einem Array, Offsets im JSON
+        index, offset = {}, 0
+        for epic, (bars, current) in candles.items():
+            index[epic] = {'offset': offset, 'count': len(bars), 'current': current}
+            offset += len(bars)
+        arrays = [bars for bars, _ in candles.values()]
+        stacked = np.concatenate(arrays) if arrays else np.empty((0, 6))
+        
+        # Neue Kerzen-Datei zuerst - das JSON verweist erst nach dem Umbenennen darauf
+        candles_file = f"candles-{int(time.time() * 1000)}.npy"
+        tmp = os.path.join(self.directory, candles_file + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, stacked)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.directory, candles_file))
+        self._sync_directory()
+        
+        meta = dict(state, version=self.VERSION, saved_at=time.time(), candles_file=candles_file, candles=index)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, separators=(',', ':'), default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._sync_directory()
+        
+        for name in os.listdir(self.directory):
+            if name.startswith('candles-') and name != candles_file:
+                os.remove(os.path.join(self.directory, name))
+    
+    def _sync_directory(self):
+        """Macht Umbenennungen dauerhaft - erst dann darf das JSON auf die neue Kerzen-Datei zeigen"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def load(self, max_age):
+        """Liefert (state, epic → (Kerzen, laufende Kerze)) oder None wenn fehlend/veraltet"""
+        try:
+            with open(self.path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        
+        if meta.get('version') != self.VERSION:
+            self.logger.warning("⚠️ Zustands-Snapshot mit anderer Version ignoriert")
+            return None
+        age = time.time() - meta['saved_at']
+        if max_age and age > max_age:
+            self.logger.warning("⚠️ Zustands-Snapshot ignoriert: %.0f min alt", age / 60)
+            return None
+        
+        bars = np.load(os.path.join(self.directory, meta['candles_file']), mmap_mode='r')
+        candles = {
+            epic: (bars[entry['offset']:entry['offset'] + entry['count']], entry['current'])
+            for epic, entry in meta.pop('candles').items()
+        }
+        return meta, candles
+
+class OrderDispatcher:
+    """Sendet vorbereitete Orders gleichzeitig und bestätigt Deals asynchron"""
+    def __init__(self, bot, workers=4):
+        self.bot = bot
+        # workers=0: alles im aufrufenden Thread (Backtest)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='order') if workers else None
+    
+    def _submit(self, fn, *args):
+        if self.executor:
+            return self.executor.submit(fn, *args)
+        # Inline wie im Pool: Fehler landen im Future statt beim Aufrufer
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def dispatch(self, orders):
+        """Sendet alle Orders gleichzeitig und wartet nur auf die Annahme, nicht auf die Bestätigung"""
+        started = time.perf_counter()
+        futures = [self._submit(self.bot.submit_order, order) for order in orders]
+        
+        responses = []
+        for order, future in zip(orders, futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                self.bot.logger.error(f"❌ Fehler beim AI Trade-Execution: {str(e)}")
+                self.bot.release_order(order['asset'])
+                response = None
+            responses.append(response)
+            if response:
+                self.confirm_async(response['dealReference'])
+        
+        elapsed = (time.perf_counter() - started) * 1000
+        self.bot.logger.info("⚡ %d/%d Orders in %.0f ms gesendet", sum(1 for r in responses if r), len(orders), elapsed)
+        return responses
+    
+    def confirm_async(self, deal_reference):
+        return self._submit(self.bot.confirm_deal, deal_reference)
+    
+    def close_async(self, asset, deal_id, reason):
+        """Schließt eine Position im Hintergrund - der Kurs-Thread wartet nicht auf den Broker"""
+        return self._submit(self.bot.close_position, asset, deal_id, reason)
+    
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False)
+
+class AsyncAPIClient:
+    """Asynchroner API-Client für parallele Requests über gepoolte Verbindungen"""
+    def __init__(self, bot, max_connections=10):
+        self.bot = bot
+        self.executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='api')
+        
+        # Keep-Alive Pool groß genug für alle parallelen Requests
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        bot.session.mount('https://', adapter)
+        bot.session.mount('http://', adapter)
+    
+    async def request(self, method, endpoint, data=None):
+        """Einzelner Request - Signatur und Fehlerbehandlung wie api_request"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.bot.api_request, method, endpoint, data)
+    
+    async def gather(self, calls):
+        """Führt unabhängige Requests gleichzeitig aus"""
+        return await asyncio.gather(*(self.request(*call) for call in calls))
+    
+    async def fetch_cycle_state(self, assets):
+        """Lädt Konto, Positionen und Kurse (leere Asset-Liste: keine) eines Zyklus parallel"""
+        calls = [("GET", f"/accounts/{self.bot.account_id}"), ("GET", "/positions")]
+        calls += [("GET", f"/markets/{self.bot.trading_assets[asset]['epic']}") for asset in assets]
+        
+        account, positions, *markets = await self.gather(calls)
+        
+        quotes = {}
+        for asset, market in zip(assets, markets):
+            snapshot = (market or {}).get('snapshot') or {}
+            if snapshot.get('bid') and snapshot.get('offer'):
+                quotes[self.bot.trading_assets[asset]['epic']] = (snapshot['bid'], snapshot['offer'])
+        
+        return account, positions, quotes
+    
+    def prefetch_cycle(self, quotes=True):
+        """Befüllt den Snapshot eines Zyklus mit einem parallelen Abruf (quotes=False: Kurse kommen vom Feed)"""
+        assets = [a for a in self.bot.target_assets if a in self.bot.trading_assets] if quotes else []
+        account, positions, quotes = asyncio.run(self.fetch_cycle_state(assets))
+        
+        account = self.bot._parse_account(account)
+        if account is not None:
+            self.bot.snapshot.put('account', account)
+        if positions and 'positions' in positions:
+            self.bot.snapshot.put('positions', positions['positions'])
+        for epic, (bid, offer) in quotes.items():
+            self.bot.quotes.update(epic, bid, offer)
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class Metrics:
+    """Zähler, Gauges und Histogramme im Prometheus-Textformat (Endpoint oder Snapshot-Datei)"""
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
+    def __init__(self, prefix='bot'):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.help = {}
+        self.counters = {}
+        self.gauges = {}
+        # (name, labels) → [Bucket-Zähler..., +Inf, Summe]
+        self.histograms = {}
+        self.server = None
+        self._writer = None
+    
+    def describe(self, name, kind, text):
+        self.help[name] = (kind, text)
+    
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def set(self, name, value, **labels):
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+    
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(self.BUCKETS) + 2)
+            series[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            series[-1] += seconds
+    
+    def timer(self, name, **labels):
+        """Kontextmanager: misst die Dauer eines Blocks als Histogramm"""
+        @contextmanager
+        def measure():
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.observe(name, time.perf_counter() - started, **labels)
+        return measure()
+    
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+    
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat"""
+        with self.lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = {key: list(series) for key, series in self.histograms.items()}
+        
+        lines = []
+        described = set()
+        
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                text = self.help.get(name, (kind, name))[1]
+                lines.append(f"# HELP {self.prefix}_{name} {text}")
+                lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+        
+        for (name, labels), value in sorted(counters.items()):
+            header(name, 'counter')
+            lines.append(f"{self.prefix}_{name}{self._labels(labels)} {value}")
+        for (name, labels), value in sorted(gauges.items()):
+            header(name, 'gauge')
+            lines.append(f"{self.prefix}_{name}{self._labels(labels)} {value}")
+        for (name, labels), series in sorted(histograms.items()):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS + ('+Inf',), series):
+                cumulative += count
+                lines.append(f"{self.prefix}_{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.prefix}_{name}_sum{self._labels(labels)} {series[-1]:.6f}")
+            lines.append(f"{self.prefix}_{name}_count{self._labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+    
+    def write_snapshot(self, path):
+        """Schreibt den aktuellen Stand atomar (für node_exporter textfile o.ä.)"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+    
+    def serve(self, port, host='127.0.0.1'):
+        """Lokaler /metrics-Endpoint in einem Hintergrund-Thread"""
+        metrics = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True).start()
+        return self.server.server_address[1]
+    
+    def start_snapshots(self, path, interval, logger):
+        """Schreibt den Snapshot periodisch, bis stop() aufgerufen wird"""
+        stopped = threading.Event()
+        
+        def run():
+            while not stopped.wait(interval):
+                try:
+                    self.write_snapshot(path)
+                except Exception as e:
+                    logger.warning("⚠️ Metrik-Snapshot fehlgeschlagen: %s", e)
+        
+        self._writer = stopped
+        threading.Thread(target=run, name='metrics-writer', daemon=True).start()
+    
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self._writer:
+            self._writer.set()
+            self._writer = None
+    
+    @staticmethod
+    def endpoint_label(endpoint):
+        """/positions/DEAL123?x=1 → /positions/{id} - hält die Label-Anzahl klein"""
+        parts = endpoint.split('?', 1)[0].strip('/').split('/')
+        return '/' + '/'.join(parts[:1] + ['{id}'] * (len(parts) - 1))
+
+def timed(metric):
+    """Methoden-Decorator: Laufzeit als Histogramm in self.metrics"""
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.metrics.observe(metric, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+class CycleProfiler:
+    """cProfile für die nächsten N Zyklen, per Signal oder Steuerdatei aktivierbar - ohne Kosten im Ruhezustand"""
+    # Zusammenfassung: nur die Funktionen, nach denen bei langsamen Zyklen zuerst gefragt wird
+    SUMMARY_FILTER = r'api_request|_send_request|enhanced_analyze_market|analyze_assets|json|decoder|logging'
+    # Ab Python 3.12 ist nur ein aktiver Profiler pro Prozess erlaubt - im Host teilen sich alle Bots diesen Platz
+    _active = threading.Lock()
+    
+    def __init__(self, directory, logger, cycle_tasks=()):
+        self.directory = directory
+        self.logger = logger
+        self.cycle_tasks = set(cycle_tasks)
+        self.armed = False
+        self.remaining = 0
+        self.profile = None
+    
+    def arm(self, cycles):
+        """Aktiviert das Profiling ab dem nächsten Zyklus (auch aus einem Signal-Handler)"""
+        self.remaining = cycles
+        self.armed = True
+    
+    def call(self, name, callback, *args):
+        """Führt eine Scheduler-Aufgabe unter cProfile aus (ohne, wenn gerade ein anderer Bot profiliert)"""
+        if not self._active.acquire(blocking=False):
+            try:
+                return callback(*args)
+            finally:
+                self._count(name)
+        
+        profile = None
+        try:
+            if self.profile is None:
+                self.profile = cProfile.Profile()
+                self.logger.info("🔬 Profiling aktiv für %d Zyklen", self.remaining)
+            try:
+                self.profile.enable()
+                profile = self.profile
+            except ValueError as e:
+                # Fremdes Profiling-Werkzeug aktiv - Aufgabe trotzdem ausführen
+                self.logger.warning("⚠️  Profiling nicht möglich: %s", str(e))
+                self.armed = False
+                self.profile = None
+            return callback(*args)
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._active.release()
+            self._count(name)
+    
+    def _count(self, name):
+        if name in self.cycle_tasks and self.armed:
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.armed = False
+                if self.profile is not None:
+                    self.dump()
+    
+    def dump(self):
+        """Schreibt pstats (für snakeviz/pstats) und eine gefilterte Text-Zusammenfassung"""
+        profile, self.profile = self.profile, None
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        profile.dump_stats(base + '.pstats')
+        
+        summary = io.StringIO()
+        stats = pstats.Stats(profile, stream=summary).sort_stats('cumulative')
+        stats.print_stats(self.SUMMARY_FILTER, 40)
+        stats.sort_stats('tottime').print_stats(25)
+        with open(base + '.txt', 'w') as f:
+            f.write(summary.getvalue())
+        self.logger.info("🔬 Profil gespeichert: %s.pstats / .txt", base)
+    
+    def check_trigger(self, path, default_cycles):
+        """Steuerdatei: vorhanden = aktivieren, Inhalt = Anzahl Zyklen; wird danach gelöscht"""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                content = f.read().strip()
+            os.remove(path)
+        except OSError:
+            return
+        self.arm(int(content) if content.isdigit() else default_cycles)
+
+class EventScheduler:
+    """Eigene Timer pro Aufgabe plus ereignisgesteuerte Auslöser statt eines festen Sleep-Takts"""
+    def __init__(self, logger, metrics=None, backoff_base=2.0, backoff_max=30.0, clock=time.monotonic):
+        self.logger = logger
+        self.metrics = metrics
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self.tasks = {}
+        self.profiler = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+    
+    def add_task(self, name, callback, interval=None, cooldown=0.0, delay=0.0):
+        """callback(keys): keys=None beim Timer-Lauf, sonst die ausgelösten Schlüssel"""
+        self.tasks[name] = {
+            'callback': callback,
+            'interval': interval,
+            'cooldown': cooldown,
+            # Timer-Aufgaben laufen ohne delay sofort zum ersten Mal
+            'due': self.clock() + delay if interval else float('inf'),
+            'blocked_until': 0.0,
+            'failures': 0
+        }
+    
+    def trigger(self, name, key=None):
+        """Löst eine Aufgabe außerhalb ihres Takts aus (thread-safe, z.B. aus dem Kurs-Listener)"""
+        with self._lock:
+            self._pending.setdefault(name, set()).add(key)
+        self._wake.set()
+    
+    def postpone(self, name):
+        """Timer-Lauf wurde anderweitig miterledigt - nächster erst nach einem vollen Intervall"""
+        task = self.tasks.get(name)
+        if task and task['interval']:
+            task['due'] = self.clock() + task['interval']
+    
+    def run_pending(self):
+        """Führt fällige und ausgelöste Aufgaben aus und liefert die Wartezeit bis zur nächsten"""
+        for name, task in self.tasks.items():
+            now = self.clock()
+            if now < task['blocked_until']:
+                continue
+            due = now >= task['due']
+            with self._lock:
+                keys = None if due else self._pending.pop(name, None)
+                if due:
+                    # Der volle Lauf deckt alle ausgelösten Schlüssel mit ab
+                    self._pending.pop(name, None)
+            if not due and not keys:
+                continue
+            
+            started = time.perf_counter()
+            try:
+                profiler = self.profiler
+                if profiler is not None and profiler.armed:
+                    profiler.call(name, task['callback'], keys)
+                else:
+                    task['callback'](keys)
+            except Exception as e:
+                # Kurzer, wachsender Backoff statt eines blinden Fensters
+                task['failures'] += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (task['failures'] - 1))
+                task['blocked_until'] = self.clock() + delay
+                if keys:
+                    with self._lock:
+                        self._pending.setdefault(name, set()).update(keys)
+                if task['interval']:
+                    task['due'] = task['blocked_until']
+                self.logger.error(f"❌ Fehler in Aufgabe {name}: {str(e)} - neuer Versuch in {delay:.0f}s")
+                if self.metrics:
+                    self.metrics.inc('cycle_errors_total', task=name)
+                continue
+            finally:
+                if self.metrics:
+                    self.metrics.observe('cycle_seconds', time.perf_counter() - started, task=name)
+            
+            task['failures'] = 0
+            task['blocked_until'] = self.clock() + task['cooldown']
+            if due:
+                task['due'] = now + task['interval']
+        
+        return self.next_wait()
+    
+    def next_wait(self):
+        now = self.clock()
+        with self._lock:
+            pending = {name for name, keys in self._pending.items() if keys}
+        wake_times = []
+        for name, task in self.tasks.items():
+            ready = task['due'] if name not in pending else now
+            wake_times.append(max(ready, task['blocked_until']))
+        return max(0.0, min(wake_times, default=1.0) - now)
+    
+    def run(self, is_running):
+        """Schleife bis is_running() False liefert - wacht bei Timern oder Auslösern auf"""
+        while is_running():
+            # Vor dem Lauf zurücksetzen - Auslöser währenddessen wecken sofort wieder
+            self._wake.clear()
+            timeout = self.run_pending()
+            self._wake.wait(min(timeout, 60.0))
+    
+    def wake(self):
+        self._wake.set()
+
+class MarketDataHub:
+    """Gemeinsame Marktdaten für mehrere Bots: ein Kurs-Feed, ein Kurs-Cache, Indikatoren pro Parametersatz"""
+    def __init__(self, candle_capacity, candle_seconds):
+        self.quotes = QuoteCache()
+        self.candles = CandleStore(candle_capacity, candle_seconds)
+        self.quotes.add_listener(self.candles.on_quote)
+        # Eine Session - Keep-Alive-Verbindungen zum Broker für alle Konten
+        self.session = requests.Session()
+        self.feed = None
+        self.instruments = None
+        self._indicators = {}
+    
+    def indicators(self, ema_fast, ema_slow, rsi_period, atr_period, window):
+        """Liefert die IndicatorStore-Instanz eines Parametersatzes - gleiche Strategien rechnen nur einmal"""
+        key = (ema_fast, ema_slow, rsi_period, atr_period, window)
+        store = self._indicators.get(key)
+        if store is None:
+            store = self._indicators[key] = IndicatorStore(*key)
+            self.candles.add_listener(store.on_bar)
+        return store
+    
+    def start_feed(self, transport, logger):
+        self.feed = QuoteFeed(transport, self.quotes, logger)
+        self.feed.start()
+    
+    def stop(self):
+        if self.feed:
+            self.feed.stop()
+
+def install_profile_signal(bots):
+    """SIGUSR1 (systemctl kill -s USR1 trading-bot) aktiviert das Profiling aller Bots"""
+    if not hasattr(signal, 'SIGUSR1'):
+        return
+    
+    def handler(signum, frame):
+        for bot in bots:
+            bot.profiler.arm(bot.profile_cycles)
+    
+    try:
+        signal.signal(signal.SIGUSR1, handler)
+    except ValueError:
+        # Nur im Haupt-Thread möglich - dann bleibt die Steuerdatei
+        pass
 
 class AITradingBot:
-    def __init__(self):
+    def __init__(self, env=None, hub=None, name=None):
         self.setup_logging()
+        if name:
+            self.logger = AccountLogAdapter(logging.getLogger(f'AITradingBot.{name}'), {'account': name})
+        self.name = name
         self.running = True
-        self.load_config()
-        self.session = requests.Session()
+        self.clock = time.time
+        
+        # Simulierter Broker im Backtest - ersetzt die HTTP-API
+        self.broker = None
+        self.load_config(env)
+        
+        # Gemeinsame Marktdaten im Mehrkonten-Betrieb (None: eigene Pipeline)
+        self.hub = hub
+        
+        # Laufzeit-Metriken: Zyklusdauer, API-Latenz pro Endpoint, Order-Roundtrip
+        self.metrics = Metrics()
+        self.metrics.describe('cycle_seconds', 'histogram', 'Dauer einer Scheduler-Aufgabe (Konto, Positionen, Analyse pro Asset-Klasse)')
+        self.metrics.describe('cycle_errors_total', 'counter', 'Fehlgeschlagene Scheduler-Aufgaben')
+        self.metrics.describe('last_cycle_timestamp', 'gauge', 'Unix-Zeit des letzten erfolgreichen Zyklus')
+        self.metrics.describe('api_latency_seconds', 'histogram', 'HTTP-Latenz pro Endpoint und Methode')
+        self.metrics.describe('api_requests_total', 'counter', 'HTTP-Requests pro Endpoint, Methode und Status')
+        self.metrics.describe('api_failures_total', 'counter', 'Requests ohne Ergebnis nach allen Wiederholungen')
+        self.metrics.describe('analysis_seconds', 'histogram', 'Dauer der Marktanalyse')
+        self.metrics.describe('trade_seconds', 'histogram', 'Dauer von execute_trade')
+        self.metrics.describe('order_roundtrip_seconds', 'histogram', 'Zeit von Order-POST bis Deal-Bestätigung')
+        self.metrics.describe('orders_total', 'counter', 'Gesendete Orders nach Ergebnis')
+        self.metrics.describe('open_positions', 'gauge', 'Offene Positionen')
+        self.metrics.describe('inference_seconds', 'histogram', 'Dauer eines Modellaufrufs (ein Batch pro Analyse)')
+        self.metrics.describe('inference_rows_total', 'counter', 'Vom Modell bewertete Feature-Vektoren')
+        self.metrics.describe('inference_cache_hits_total', 'counter', 'Aus dem Cache beantwortete Feature-Vektoren')
+        self._order_started = {}
+        
+        # Gesendete, noch nicht im Positionsstand sichtbare Orders: Asset → (Zeitpunkt, Deal-Referenz)
+        self.pending_orders = {}
+        self._pending_lock = threading.Lock()
+        
+        self.session = hub.session if hub else requests.Session()
+        self.scheduler = RequestScheduler(
+            self._send_request, self.logger, self.api_rate_limit, self.api_burst,
+            self.api_max_retries, self.api_backoff_base, self.api_backoff_max
+        )
         
-        # Wechselkurs
-        self.eur_usd_rate = 1.08
+        # Konto-/Positions-Snapshot: ein konsistenter Stand pro Zyklus
+        self.snapshot = SnapshotCache(self.account_cache_ttl)
+        
+        # Optionaler asynchroner Client für parallele Abrufe pro Zyklus
+        self.async_client = AsyncAPIClient(self, self.api_max_connections) if self.async_api else None
+        
+        # Wechselkurs: aus dem Kurs-Stream, sonst periodisch abgefragt (eur_usd_rate)
+        self.fx = FxRateCache(self.fx_epic, self.fx_fallback_rate, self.fx_max_age, clock=lambda: self.clock())
         
         # Trading-Assets mit spezifischen Einstellungen
         self.trading_assets = {
@@ -36,58 +1918,220 @@ class AITradingBot:
         
         # AI Trading Parameter
         self.target_assets = ["BTC", "ETH", "SOL", "XRP", "DOGE", "BNB", "KUPFER", "GAS"]
+        
+        # Rückwärts-Index Epic → Asset-Name
+        self.epic_index = {info['epic']: name for name, info in self.trading_assets.items()}
+        
+        # Mindestgröße, Schrittweite, Margin und Handelszeiten (lot_size nur als Rückfall)
+        if hub and hub.instruments:
+            self.instruments = hub.instruments
+        else:
+            self.instruments = InstrumentStore(self.instrument_cache_path, self.instrument_cache_ttl, self.logger)
+            if hub:
+                hub.instruments = self.instruments
         self.min_position_eur = 5.00
         
+        # Vektorisierte Signalberechnung für alle Assets
+        self.engine = SignalEngine(
+            self.ema_fast, self.ema_slow, self.rsi_period, self.atr_period,
+            load_signal_model(self.signal_model_path), self.metrics
+        )
+        self.logger.info("🧠 Signalmodell: %s%s", self.engine.model.name, f" ({self.signal_model_path})" if self.signal_model_path else "")
+        self.quote_feed = None
+        
+        if hub:
+            self.quotes = hub.quotes
+            self.candles = hub.candles
+            self.indicators = hub.indicators(self.ema_fast, self.ema_slow, self.rsi_period, self.atr_period, self.indicator_window)
+        else:
+            # Live-Kurse (Bid/Ask/Zeitstempel pro Epic)
+            self.quotes = QuoteCache(clock=lambda: self.clock())
+            
+            # Kurshistorie: Kerzen pro Epic mit begrenztem Speicher
+            self.candles = CandleStore(self.candle_capacity, self.candle_seconds)
+            self.quotes.add_listener(self.candles.on_quote)
+            
+            # Laufende Indikatoren (O(1) pro Kerze) statt Neuberechnung über das Fenster
+            self.indicators = IndicatorStore(self.ema_fast, self.ema_slow, self.rsi_period, self.atr_period, self.indicator_window)
+            self.candles.add_listener(self.indicators.on_bar)
+        self.quotes.add_listener(self.fx.on_quote)
+        
+        # Orders parallel senden, Bestätigungen im Hintergrund
+        self.dispatcher = OrderDispatcher(self, self.order_workers)
+        
         # Trading-Status
         self.open_positions = {}
-        self.trade_history = []
+        self.reconciler = PositionReconciler(self.open_positions, self.epic_index)
+        self.reconciler.add_listener(self.on_position_event)
+        
+        # Client-seitige Exits pro Tick (Trailing-Stop, Break-Even, Haltedauer)
+        self.exit_engine = ExitEngine(
+            lambda asset, deal_id, reason: self.dispatcher.close_async(asset, deal_id, reason),
+            self.logger, self.trailing_stop_percent, self.break_even_percent, self.max_hold_minutes * 60,
+            clock=lambda: self.clock()
+        )
+        if self.exit_engine.enabled:
+            self.reconciler.add_listener(self.exit_engine.on_position_event)
+            self.quotes.add_listener(self.exit_engine.on_quote)
+        
+        # Trade-Journal auf Platte, im Speicher nur das jüngste Fenster
+        self.journal = TradeJournal(self.trade_journal_path, self.logger)
+        self.trade_history = deque(self.journal.query(limit=self.trade_history_size), maxlen=self.trade_history_size)
         self.last_analysis = {}
         
+        # Profiling auf Abruf (SIGUSR1 / PROFILE_TRIGGER_FILE), im Ruhezustand nur ein Flag
+        self.profiler = CycleProfiler(self.profile_dir, self.logger)
+        
+        # Laufzeit-Snapshot für den Warmstart (wird erst in launch() geladen)
+        self.state_store = StateStore(self.state_dir, self.logger) if self.state_dir else None
+        
+        # Ereignisgesteuerter Takt (nur im Live-Betrieb, Backtest nutzt run_cycle)
+        self.event_scheduler = None
+        self._move_reference = None
+        self.analysis_count = 0
+        self.positions_synced = False
+        
     def setup_logging(self):
         """Setup Logging"""
-        try:
-            log_file = '/tmp/ai-trading-bot.log'
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                handlers=[
-                    logging.FileHandler(log_file),
-                    logging.StreamHandler(sys.stdout)
-                ]
-            )
-            self.logger = logging.getLogger('AITradingBot')
+        root = logging.getLogger()
+        log_file = os.getenv('LOG_FILE', '/tmp/ai-trading-bot.log')
+        
+        # Nicht-blockierend: der Trading-Thread reiht nur ein, geschrieben wird im Hintergrund
+        if not has_log_listener(root):
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            handlers = [logging.StreamHandler(sys.stdout)]
+            try:
+                handlers.insert(0, logging.handlers.RotatingFileHandler(
+                    log_file,
+                    maxBytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+                    backupCount=int(os.getenv('LOG_BACKUP_COUNT', '5'))
+                ))
+            except Exception:
+                log_file = None
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            start_log_listener(root, handlers, os.getenv('LOG_LEVEL', 'INFO').upper())
+        
+        self.logger = logging.getLogger('AITradingBot')
+        if log_file:
             self.logger.info(f"✅ AI Trading Bot Logging initialisiert: {log_file}")
-            
-        except Exception as e:
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                handlers=[logging.StreamHandler(sys.stdout)]
-            )
-            self.logger = logging.getLogger('AITradingBot')
-        
-    def load_config(self):
-        """Lädt Konfiguration"""
-        self.api_key = os.getenv('API_KEY', '').strip()
-        self.api_secret = os.getenv('API_SECRET', '').strip()
-        self.account_id = os.getenv('ACCOUNT_ID', '').strip()
-        self.account_currency = os.getenv('ACCOUNT_CURRENCY', 'EUR')
-        self.demo_mode = os.getenv('DEMO_MODE', 'False').lower() == 'true'
-        self.auto_trading = os.getenv('AUTO_TRADING', 'True').lower() == 'true'
-        self.check_interval = int(os.getenv('CHECK_INTERVAL', '60'))
+        
+        # Optionales strukturiertes Log (JSON-Zeilen) statt Text-Dump der Signale
+        self.event_logger = None
+        structured_log = os.getenv('STRUCTURED_LOG', '').strip()
+        if structured_log:
+            self.event_logger = logging.getLogger('AITradingBot.events')
+            self.event_logger.propagate = False
+            if not has_log_listener(self.event_logger):
+                handler = logging.handlers.RotatingFileHandler(
+                    structured_log,
+                    maxBytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+                    backupCount=int(os.getenv('LOG_BACKUP_COUNT', '5'))
+                )
+                handler.setFormatter(JsonLinesFormatter())
+                start_log_listener(self.event_logger, [handler], logging.INFO)
+    
+    def log_event(self, event, **fields):
+        """Schreibt ein strukturiertes Event (nur mit STRUCTURED_LOG)"""
+        if self.event_logger:
+            self.event_logger.info(event, extra={'fields': fields})
+    
+    def load_config(self, env=None):
+        """Lädt Konfiguration (aus der Prozess-Umgebung oder einer .env-Zuordnung)"""
+        env = os.environ if env is None else env
+        self.api_key = env.get('API_KEY', '').strip()
+        self.api_secret = env.get('API_SECRET', '').strip()
+        self.account_id = env.get('ACCOUNT_ID', '').strip()
+        self.account_currency = env.get('ACCOUNT_CURRENCY', 'EUR')
+        self.api_base_url = env.get('API_BASE_URL', 'https://api-capital.backend-capital.com').rstrip('/')
+        self.demo_mode = env.get('DEMO_MODE', 'False').lower() == 'true'
+        self.auto_trading = env.get('AUTO_TRADING', 'True').lower() == 'true'
+        self.check_interval = int(env.get('CHECK_INTERVAL', '60'))
+        
+        # Eigene Takte pro Asset-Klasse und für Konto/Positionen, Analyse zusätzlich bei Kursbewegung
+        self.crypto_check_interval = float(env.get('CRYPTO_CHECK_INTERVAL', str(self.check_interval)))
+        self.commodity_check_interval = float(env.get('COMMODITY_CHECK_INTERVAL', str(self.check_interval)))
+        self.balance_refresh_interval = float(env.get('BALANCE_REFRESH_INTERVAL', str(self.check_interval)))
+        self.position_refresh_interval = float(env.get('POSITION_REFRESH_INTERVAL', str(self.check_interval)))
+        self.move_trigger_percent = float(env.get('MOVE_TRIGGER_PERCENT', '0.005'))
+        self.error_backoff_max = float(env.get('ERROR_BACKOFF_MAX', '30'))
+        self.account_cache_ttl = float(env.get('ACCOUNT_CACHE_TTL', '15'))
+        self.async_api = env.get('ASYNC_API', 'False').lower() == 'true'
+        self.api_max_connections = int(env.get('API_MAX_CONNECTIONS', '10'))
+        
+        # Broker-Limits und Wiederholungen
+        self.api_rate_limit = float(env.get('API_RATE_LIMIT', '10'))
+        self.api_burst = int(env.get('API_BURST', '10'))
+        self.api_max_retries = int(env.get('API_MAX_RETRIES', '3'))
+        self.api_backoff_base = float(env.get('API_BACKOFF_BASE', '0.5'))
+        self.api_backoff_max = float(env.get('API_BACKOFF_MAX', '8'))
+        
+        # Kursdaten
+        self.quote_source = env.get('QUOTE_SOURCE', 'rest').lower()
+        self.quote_stream_url = env.get('QUOTE_STREAM_URL', 'wss://api-streaming-capital.backend-capital.com/connect')
+        self.quote_replay_file = env.get('QUOTE_REPLAY_FILE', '')
+        self.quote_poll_interval = float(env.get('QUOTE_POLL_INTERVAL', '2'))
+        self.max_quote_age = float(env.get('MAX_QUOTE_AGE', '10'))
+        self.candle_seconds = int(env.get('CANDLE_SECONDS', '60'))
+        self.candle_capacity = int(env.get('CANDLE_CAPACITY', '1440'))
+        
+        # Indikatoren
+        self.indicator_window = int(env.get('INDICATOR_WINDOW', '60'))
+        self.ema_fast = int(env.get('EMA_FAST', '12'))
+        self.ema_slow = int(env.get('EMA_SLOW', '26'))
+        self.rsi_period = int(env.get('RSI_PERIOD', '14'))
+        self.atr_period = int(env.get('ATR_PERIOD', '14'))
         
         # Hebel-Einstellungen
-        self.crypto_leverage = int(os.getenv('CRYPTO_LEVERAGE', '2'))
-        self.commodity_leverage = int(os.getenv('COMMODITY_LEVERAGE', '20'))
-        self.risk_per_trade = float(os.getenv('RISK_PER_TRADE', '0.15'))  # 15% Risiko
-        self.max_position_size = float(os.getenv('MAX_POSITION_SIZE', '0.8'))
+        self.crypto_leverage = int(env.get('CRYPTO_LEVERAGE', '2'))
+        self.commodity_leverage = int(env.get('COMMODITY_LEVERAGE', '20'))
+        self.risk_per_trade = float(env.get('RISK_PER_TRADE', '0.15'))  # 15% Risiko
+        self.max_position_size = float(env.get('MAX_POSITION_SIZE', '0.8'))
         
         # Trading-Parameter
-        self.stop_loss_percent = float(os.getenv('STOP_LOSS_PERCENT', '0.05'))
-        self.take_profit_percent = float(os.getenv('TAKE_PROFIT_PERCENT', '0.08'))
-        self.max_open_trades = int(os.getenv('MAX_OPEN_TRADES', '3'))
-        self.enable_crypto = os.getenv('ENABLE_CRYPTO', 'True').lower() == 'true'
-        self.enable_commodities = os.getenv('ENABLE_COMMODITIES', 'True').lower() == 'true'
+        self.stop_loss_percent = float(env.get('STOP_LOSS_PERCENT', '0.05'))
+        self.take_profit_percent = float(env.get('TAKE_PROFIT_PERCENT', '0.08'))
+        self.max_open_trades = int(env.get('MAX_OPEN_TRADES', '3'))
+        # Reservierung verfällt, falls der Positionsabgleich eine Order nie meldet
+        self.pending_order_timeout = float(env.get('PENDING_ORDER_TIMEOUT', '300'))
+        
+        # Profiling zur Laufzeit: SIGUSR1 oder Steuerdatei
+        self.profile_dir = env.get('PROFILE_DIR', 'profiles')
+        self.profile_cycles = int(env.get('PROFILE_CYCLES', '5'))
+        self.profile_trigger_file = env.get('PROFILE_TRIGGER_FILE', 'profile.trigger')
+        
+        # Signalmodell (.npz / .joblib / .onnx, leer = Heuristik)
+        self.signal_model_path = env.get('SIGNAL_MODEL_PATH', '')
+        
+        # Exit-Engine (0 = aus)
+        self.trailing_stop_percent = float(env.get('TRAILING_STOP_PERCENT', '0'))
+        self.break_even_percent = float(env.get('BREAK_EVEN_PERCENT', '0'))
+        self.max_hold_minutes = float(env.get('MAX_HOLD_MINUTES', '0'))
+        self.trade_journal_path = env.get('TRADE_JOURNAL_PATH', 'trade_journal.db')
+        self.trade_history_size = int(env.get('TRADE_HISTORY_SIZE', '500'))
+        self.order_workers = int(env.get('ORDER_WORKERS', str(max(4, self.max_open_trades))))
+        self.enable_crypto = env.get('ENABLE_CRYPTO', 'True').lower() == 'true'
+        self.enable_commodities = env.get('ENABLE_COMMODITIES', 'True').lower() == 'true'
+        
+        # Metriken: lokaler /metrics-Endpoint (0 = aus) und/oder Snapshot-Datei
+        self.metrics_port = int(env.get('METRICS_PORT', '0'))
+        self.metrics_file = env.get('METRICS_FILE', '')
+        self.metrics_interval = float(env.get('METRICS_INTERVAL', '15'))
+        
+        # Warmstart: Zustands-Snapshot (leer = aus)
+        self.state_dir = env.get('STATE_DIR', 'state')
+        self.state_interval = float(env.get('STATE_INTERVAL', '60'))
+        self.state_max_age = float(env.get('STATE_MAX_AGE', str(6 * 3600)))
+        
+        # Instrument-Stammdaten vom Broker (leer = nur im Speicher)
+        self.instrument_cache_path = env.get('INSTRUMENT_CACHE_PATH', 'instruments.json')
+        self.instrument_cache_ttl = float(env.get('INSTRUMENT_CACHE_TTL', str(24 * 3600)))
+        
+        # Wechselkurs EUR/USD (Konto in EUR, Instrumente in USD)
+        self.fx_epic = env.get('FX_EPIC', 'EURUSD')
+        self.fx_fallback_rate = float(env.get('FX_FALLBACK_RATE', '1.08'))
+        self.fx_max_age = float(env.get('FX_MAX_AGE', '900'))
+        self.fx_refresh_interval = float(env.get('FX_REFRESH_INTERVAL', '300'))
         
         self.logger.info("✅ AI Trading Bot Konfiguration geladen")
         self.logger.info(f"🔧 Auto-Trading: {self.auto_trading}")
@@ -107,58 +2151,115 @@ class AITradingBot:
     
     def api_request(self, method, endpoint, data=None):
         """Macht API Request"""
-        try:
-            base_url = "https://api-capital.backend-capital.com"
-            path = f"/api/v1{endpoint}"
-            body = json.dumps(data) if data else ""
-            
-            timestamp, signature = self.generate_signature(method, path, body)
-            
-            headers = {
-                "X-CAP-API-KEY": self.api_key,
-                "X-SECURITY-TOKEN": signature,
-                "X-TIMESTAMP": timestamp,
-                "Content-Type": "application/json"
-            }
-            
-            url = base_url + path
-            
-            if method == "GET":
-                response = self.session.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                response = self.session.post(url, data=body, headers=headers, timeout=30)
-            elif method == "DELETE":
-                response = self.session.delete(url, headers=headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
-            if response.status_code != 200:
-                self.logger.error(f"❌ API Error {response.status_code}: {response.text}")
-                return None
-                
-            return response.json()
-            
-        except Exception as e:
-            self.logger.error(f"❌ API request failed: {str(e)}")
+        if self.broker is not None:
+            return self.broker.request(method, endpoint, data)
+        
+        # Rate-Limit, Retry und Coalescing über den zentralen Scheduler
+        result = self.scheduler.request(method, endpoint, data)
+        if result is None:
+            self.metrics.inc('api_failures_total', endpoint=Metrics.endpoint_label(endpoint), method=method)
+        return result
+    
+    def _send_request(self, method, endpoint, data=None):
+        """Sendet einen signierten HTTP-Request und liefert die Response"""
+        base_url = self.api_base_url
+        path = f"/api/v1{endpoint}"
+        body = json.dumps(data) if data else ""
+        
+        timestamp, signature = self.generate_signature(method, path, body)
+        
+        headers = {
+            "X-CAP-API-KEY": self.api_key,
+            "X-SECURITY-TOKEN": signature,
+            "X-TIMESTAMP": timestamp,
+            "Content-Type": "application/json"
+        }
+        
+        url = base_url + path
+        
+        if method == "GET":
+            send = self.session.get
+        elif method == "POST":
+            send = partial(self.session.post, data=body)
+        elif method == "DELETE":
+            send = self.session.delete
+        else:
+            raise ValueError(f"Unsupported method: {method}")
+        
+        # Latenz pro Versuch - die Wartezeit im Scheduler zählt nicht zur Broker-Latenz
+        label = Metrics.endpoint_label(endpoint)
+        status = 'error'
+        started = time.perf_counter()
+        try:
+            response = send(url, headers=headers, timeout=30)
+            status = str(response.status_code)
+            return response
+        finally:
+            self.metrics.observe('api_latency_seconds', time.perf_counter() - started, endpoint=label, method=method)
+            self.metrics.inc('api_requests_total', endpoint=label, method=method, status=status)
+    
+    def _load_account(self):
+        """Lädt Depotdaten von der API"""
+        return self._parse_account(self.api_request("GET", f"/accounts/{self.account_id}"))
+    
+    @property
+    def eur_usd_rate(self):
+        return self.fx.rate
+    
+    def refresh_fx_rate(self):
+        """Fragt den Wechselkurs ab, falls der Kurs-Stream ihn nicht aktuell hält"""
+        if self.fx.age() < self.fx_refresh_interval:
+            return
+        market = self.api_request("GET", f"/markets/{self.fx_epic}")
+        snapshot = (market or {}).get('snapshot') or {}
+        if not (snapshot.get('bid') and snapshot.get('offer')):
+            raise RuntimeError(f"Wechselkurs {self.fx_epic} nicht verfügbar")
+        self.fx.update((snapshot['bid'] + snapshot['offer']) / 2)
+    
+    def _parse_account(self, response):
+        """Wertet die Depotdaten-Antwort aus"""
+        if not response:
             return None
+        
+        balance = response.get('balance', 0)
+        available = response.get('available', 0)
+        profit_loss = response.get('profitLoss', 0)
+        currency = response.get('currency', 'EUR')
+        
+        balance_usd = balance * self.eur_usd_rate
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"💰 Depotwert: €{balance:,.2f} {currency}")
+            self.logger.info(f"💵 Entspricht: ${balance_usd:,.2f} USD")
+            self.logger.info(f"📈 Verfügbar: €{available:,.2f} | P&L: €{profit_loss:,.2f}")
+        
+        return balance, balance_usd, available, profit_loss
+    
+    def quote_epics(self):
+        """Alle Epics für den Kurs-Feed: gehandelte Assets plus Wechselkurs"""
+        epics = [self.trading_assets[a]['epic'] for a in self.target_assets if a in self.trading_assets]
+        return epics + [self.fx_epic]
+    
+    def create_quote_transport(self, epics=None):
+        """Erzeugt den konfigurierten Kurs-Transport (QUOTE_SOURCE)"""
+        if epics is None:
+            epics = self.quote_epics()
+        
+        if self.quote_source == 'websocket':
+            return WebSocketQuoteTransport(self, epics, self.quote_stream_url)
+        elif self.quote_source == 'replay':
+            return ReplayQuoteTransport(self.quote_replay_file)
+        elif self.quote_source == 'rest':
+            return RestQuoteTransport(self, epics, self.quote_poll_interval)
+        else:
+            raise ValueError(f"Unbekannte QUOTE_SOURCE: {self.quote_source}")
     
     def get_account_balance(self):
         """Ermittelt Depotwert"""
         try:
-            response = self.api_request("GET", f"/accounts/{self.account_id}")
-            if response:
-                balance = response.get('balance', 0)
-                available = response.get('available', 0)
-                profit_loss = response.get('profitLoss', 0)
-                currency = response.get('currency', 'EUR')
-                
-                balance_usd = balance * self.eur_usd_rate
-                
-                self.logger.info(f"💰 Depotwert: €{balance:,.2f} {currency}")
-                self.logger.info(f"💵 Entspricht: ${balance_usd:,.2f} USD")
-                self.logger.info(f"📈 Verfügbar: €{available:,.2f} | P&L: €{profit_loss:,.2f}")
-                
-                return balance, balance_usd, available, profit_loss
+            account = self.snapshot.get('account', self._load_account)
+            if account:
+                return account
             else:
                 self.logger.error("❌ Konnte Depotdaten nicht abrufen")
                 return 0, 0, 0, 0
@@ -167,415 +2268,1791 @@ class AITradingBot:
             self.logger.error(f"❌ Fehler bei Depotwert-Abfrage: {str(e)}")
             return 0, 0, 0, 0
     
+    def _load_positions(self):
+        """Lädt offene Positionen von der API"""
+        response = self.api_request("GET", "/positions")
+        if response and 'positions' in response:
+            return response['positions']
+        return None
+    
     def get_open_positions(self):
         """Ermittelt offene Positionen"""
         try:
-            response = self.api_request("GET", "/positions")
-            if response and 'positions' in response:
-                positions = response['positions']
-                
-                # Aktualisiere unsere Positions-Datenbank
-                self.open_positions = {}
-                for position in positions:
-                    epic = position.get('epic', 'Unknown')
-                    deal_id = position.get('position', {}).get('dealId')
-                    
-                    # Finde Asset-Namen
-                    asset_name = "Unknown"
-                    for name, info in self.trading_assets.items():
-                        if info['epic'] == epic:
-                            asset_name = name
-                            break
-                    
-                    if deal_id and asset_name != "Unknown":
-                        self.open_positions[asset_name] = {
-                            'deal_id': deal_id,
-                            'epic': epic,
-                            'direction': position.get('position', {}).get('direction', 'UNKNOWN'),
-                            'size': position.get('position', {}).get('size', 0),
-                            'profit': position.get('position', {}).get('profit', 0),
-                            'open_level': position.get('position', {}).get('openLevel', 0)
-                        }
+            positions = self.snapshot.get('positions', self._load_positions)
+            self.positions_synced = positions is not None
+            if positions is not None:
+                # Nur Änderungen gegenüber dem letzten Stand anwenden
+                self.reconciler.reconcile(positions)
                 
-                self.logger.info(f"📊 Offene Positionen: {len(self.open_positions)}")
+                self.logger.info("📊 Offene Positionen: %d", len(self.open_positions))
                 
                 if self.open_positions:
                     total_pl = 0
                     for asset, pos in self.open_positions.items():
                         profit_color = "🟢" if pos['profit'] >= 0 else "🔴"
-                        self.logger.info(f"   {profit_color} {asset:8} | {pos['direction']:4} | Size: {pos['size']:6.2f} | P&L: €{pos['profit']:8.2f}")
+                        self.logger.info("   %s %-8s | %-4s | Size: %6.2f | P&L: €%8.2f", profit_color, asset, pos['direction'], pos['size'], pos['profit'])
                         total_pl += pos['profit']
                     
-                    self.logger.info(f"   📈 Gesamt-P&L: €{total_pl:8.2f}")
+                    self.logger.info("   📈 Gesamt-P&L: €%8.2f", total_pl)
                 else:
                     self.logger.info("   Keine offenen Positionen")
                     
                 return self.open_positions
             else:
-                self.logger.info("📊 Keine offenen Positionen gefunden")
-                return {}
+                # Kein Abruf heißt nicht "keine Positionen" - letzter Stand bleibt
+                self.logger.warning("⚠️ Positionen konnten nicht abgerufen werden")
+                return None
                 
         except Exception as e:
             self.logger.error(f"❌ Fehler beim Abrufen der Positionen: {str(e)}")
-            return {}
+            return None
+    
+    def on_position_event(self, event, asset, position):
+        """Protokolliert eröffnete, geschlossene und geänderte Positionen"""
+        if event == 'opened':
+            self.release_order(asset)
+            self.logger.info("📥 Position eröffnet: %s %s %s @ %s", asset, position['direction'], position['size'], position['open_level'])
+        elif event == 'closed':
+            self.logger.info("📤 Position geschlossen: %s (Deal %s, letzter P&L: €%.2f)", asset, position['deal_id'], position['profit'])
+        else:
+            self.logger.info("🔁 Position geändert: %s Size: %s | SL: %s | TP: %s", asset, position['size'], position['stop_level'], position['limit_level'])
+    
+    def calculate_position_size(self, balance_eur, asset, current_price):
+        """Berechnet Positionsgröße basierend auf Risiko und Preis"""
+        risk_amount_eur = balance_eur * self.risk_per_trade
+        asset_info = self.trading_assets[asset]
+        
+        if asset_info['type'] == "crypto":
+            leverage = self.crypto_leverage
+        else:
+            leverage = self.commodity_leverage
+        
+        # Nicht mehr Hebel als der Broker für das Instrument erlaubt
+        max_leverage = self.instruments.max_leverage(asset_info['epic'])
+        if max_leverage:
+            leverage = min(leverage, max_leverage)
+            
+        # Positionsgröße: EUR-Wert in USD umrechnen, Instrumente notieren in USD
+        position_value_eur = risk_amount_eur * leverage
+        position_size = position_value_eur * self.eur_usd_rate / current_price
+        
+        # Auf Mindestgröße und Schrittweite des Instruments anpassen
+        position_size = self.instruments.round_size(asset_info['epic'], position_size, asset_info.get('lot_size', 1))
+        
+        return position_size, leverage, position_value_eur
+    
+    def load_instruments(self, force=False):
+        """Lädt fehlende oder abgelaufene Instrument-Daten mit einem gebündelten Request"""
+        epics = [info['epic'] for info in self.trading_assets.values()]
+        
+        def fetch(stale):
+            response = self.api_request("GET", "/markets?epics=" + ",".join(stale))
+            return None if response is None else response.get('marketDetails', [])
+        
+        return self.instruments.refresh(fetch, epics, force)
+    
+    @timed('analysis_seconds')
+    def enhanced_analyze_market(self, assets=None):
+        """Erweiterte Marktanalyse mit AI-gesteuerten Signalen (optional nur für einen Teil der Assets)"""
+        signals = {}
+        candidates = []
+        balance_eur, _, _, _ = self.get_account_balance()
+        
+        for asset in self.target_assets if assets is None else assets:
+            if asset not in self.trading_assets:
+                continue
+                
+            asset_info = self.trading_assets[asset]
+            
+            # Aktueller Marktpreis aus dem Kurs-Cache (kein Request)
+            if not self.quotes.is_fresh(asset_info['epic'], self.max_quote_age):
+                signals[asset] = {'signal': 'HOLD', 'price': self.quotes.mid(asset_info['epic']) or 0, 'reason': 'Kein aktueller Kurs'}
+                continue
+            current_price = self.quotes.mid(asset_info['epic'])
+            
+            # Berechne mögliche Positionsgröße
+            position_size, leverage, position_value = self.calculate_position_size(
+                balance_eur, asset, current_price
+            )
+            
+            # Prüfe Mindestposition
+            if position_value < self.min_position_eur:
+                signals[asset] = {'signal': 'HOLD', 'price': current_price, 'reason': 'Position zu klein'}
+                continue
+            
+            candidates.append((asset, current_price, leverage, position_size, position_value))
+        
+        # AI-gesteuerte Signalanalyse - ein Durchlauf für alle Kandidaten
+        analysis = self.analyze_assets([c[0] for c in candidates], [c[1] for c in candidates])
+        
+        for (asset, current_price, leverage, position_size, position_value), signal_data in zip(candidates, analysis):
+            signals[asset] = {
+                'signal': signal_data['direction'],
+                'price': current_price,
+                'type': self.trading_assets[asset]['type'],
+                'leverage': leverage,
+                'position_size': position_size,
+                'position_value_eur': position_value,
+                'stop_loss': signal_data['stop_loss'],
+                'take_profit': signal_data['take_profit'],
+                'confidence': signal_data['confidence'],
+                'reason': signal_data['reason']
+            }
+        
+        return {asset: signals[asset] for asset in self.target_assets if asset in signals}
+    
+    def analyze_assets(self, assets, prices):
+        """AI-Analyse für mehrere Assets als ein vektorisierter Durchlauf"""
+        results = [None] * len(assets)
+        features = np.empty((len(assets), 4))
+        ready = []
+        batch = []
+        
+        for i, asset in enumerate(assets):
+            epic = self.trading_assets[asset]['epic']
+            indicators = self.indicators.get(epic)
+            buffer = self.candles.buffer(epic)
+            
+            # Laufende Indikatoren bevorzugen, sonst über das Kerzenfenster rechnen
+            if indicators and indicators.count >= self.indicator_window:
+                features[i] = indicators.features()
+                ready.append(i)
+            elif buffer.count >= self.indicator_window:
+                batch.append(i)
+                ready.append(i)
+            else:
+                results[i] = {
+                    'direction': 'HOLD',
+                    'stop_loss': prices[i],
+                    'take_profit': prices[i],
+                    'confidence': 0.5,
+                    'reason': f"Zu wenig Kurshistorie ({indicators.count if indicators else buffer.count}/{self.indicator_window})"
+                }
+        
+        if batch:
+            bars = np.stack([self.candles.window(self.trading_assets[assets[i]]['epic'], self.indicator_window) for i in batch])
+            features[batch] = self.engine.features(bars)
+        
+        if ready:
+            scores = self.engine.scores(features[ready], [self.trading_assets[assets[i]]['epic'] for i in ready])
+            analysis = self.engine.signals(
+                [self.trading_assets[assets[i]]['type'] for i in ready],
+                [prices[i] for i in ready],
+                scores, self.stop_loss_percent, self.take_profit_percent
+            )
+            for i, signal_data in zip(ready, analysis):
+                results[i] = signal_data
+        
+        return results
+    
+    def analyze_crypto_trend(self, asset, current_price):
+        """AI-Analyse für Krypto-Trends"""
+        return self.analyze_assets([asset], [current_price])[0]
+    
+    def analyze_commodity_trend(self, asset, current_price):
+        """AI-Analyse für Rohstoff-Trends"""
+        # Konservativere Schwellen über den Asset-Typ in SignalEngine.signals
+        return self.analyze_assets([asset], [current_price])[0]
+    
+    def build_trade_payload(self, asset, direction, stop_loss, take_profit, balance_eur):
+        """Bereitet die Order-Daten vor (ohne Request) - None wenn nicht handelbar"""
+        asset_info = self.trading_assets.get(asset)
+        if not asset_info:
+            self.logger.error(f"❌ Unbekanntes Asset: {asset}")
+            return None
+        
+        # Nie auf veralteten Kursen handeln
+        quote = self.quotes.get(asset_info['epic'])
+        if not self.quotes.is_fresh(asset_info['epic'], self.max_quote_age):
+            self.logger.warning("⏭️  Trade übersprungen: Kein aktueller Kurs für %s", asset)
+            return None
+        current_price = quote[1] if direction == 'BUY' else quote[0]
+        
+        # Ohne aktuellen Wechselkurs stimmt die Positionsgröße nicht
+        if not self.fx.is_fresh():
+            self.logger.warning("⏭️  Trade übersprungen: Wechselkurs %s veraltet (%.0fs)", self.fx_epic, self.fx.age())
+            return None
+        
+        # Außerhalb der Handelszeiten lehnt der Broker ab
+        if not self.instruments.is_open(asset_info['epic'], self.clock()):
+            self.logger.info("⏭️  Trade übersprungen: Markt für %s geschlossen", asset)
+            return None
+        
+        # Positionsgröße berechnen
+        position_size, leverage, position_value = self.calculate_position_size(
+            balance_eur, asset, current_price
+        )
+        
+        # Trade-Daten vorbereiten
+        trade_data = {
+            "epic": asset_info['epic'],
+            "expiry": "-",
+            "direction": direction,
+            "size": position_size,
+            "orderType": "MARKET",
+            "timeInForce": "FILL_OR_KILL",
+            "level": current_price,
+            "guaranteedStop": False,
+            "stopLevel": stop_loss,
+            "stopDistance": 0,
+            "trailingStop": False,
+            "profitLevel": take_profit,
+            "profitDistance": 0,
+            "currencyCode": "USD"
+        }
+        
+        return {
+            'asset': asset,
+            'trade_data': trade_data,
+            'leverage': leverage,
+            'position_value': position_value
+        }
+    
+    def submit_order(self, order):
+        """Sendet eine vorbereitete Order und verbucht sie"""
+        asset = order['asset']
+        trade_data = order['trade_data']
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"🎯 AI EXECUTING TRADE: {asset} {trade_data['direction']}")
+            self.logger.info(f"   📏 Size: {trade_data['size']} | Leverage: {order['leverage']}:1")
+            self.logger.info(f"   💰 Value: €{order['position_value']:,.2f}")
+            self.logger.info(f"   🛑 Stop-Loss: {trade_data['stopLevel']:.4f}")
+            self.logger.info(f"   🎯 Take-Profit: {trade_data['profitLevel']:.4f}")
+        
+        # Trade ausführen
+        started = time.perf_counter()
+        response = self.api_request("POST", "/positions", trade_data)
+        
+        if response and 'dealReference' in response:
+            self.logger.info("✅ AI TRADE ERFOLGREICH: Deal Reference: %s", response['dealReference'])
+            self.metrics.inc('orders_total', result='accepted')
+            self._order_started[response['dealReference']] = started
+            with self._pending_lock:
+                if asset in self.pending_orders:
+                    self.pending_orders[asset] = (self.pending_orders[asset][0], response['dealReference'])
+            
+            # Konto und Positionen haben sich geändert
+            self.snapshot.invalidate()
+            
+            # Trade zur History hinzufügen
+            trade_record = {
+                'timestamp': datetime.fromtimestamp(self.clock()),
+                'asset': asset,
+                'direction': trade_data['direction'],
+                'size': trade_data['size'],
+                'price': trade_data['level'],
+                'stop_loss': trade_data['stopLevel'],
+                'take_profit': trade_data['profitLevel'],
+                'deal_reference': response['dealReference'],
+                'leverage': order['leverage']
+            }
+            self.record_trade(trade_record)
+            
+            return response
+        else:
+            self.logger.error(f"❌ AI TRADE FEHLGESCHLAGEN: {response}")
+            self.metrics.inc('orders_total', result='failed')
+            self.release_order(asset)
+            return None
+    
+    def confirm_deal(self, deal_reference):
+        """Prüft das Ergebnis einer Order beim Broker"""
+        confirmation = self.api_request("GET", f"/confirms/{deal_reference}")
+        started = self._order_started.pop(deal_reference, None)
+        if started is not None:
+            self.metrics.observe('order_roundtrip_seconds', time.perf_counter() - started)
+        if not confirmation:
+            self.logger.warning("⚠️ Keine Bestätigung für Deal %s", deal_reference)
+            return None
+        
+        status = confirmation.get('dealStatus', 'UNKNOWN')
+        if status == 'ACCEPTED':
+            self.logger.info("✅ Deal bestätigt: %s → %s", deal_reference, confirmation.get('dealId'))
+        else:
+            self.logger.error(f"❌ Deal abgelehnt: {deal_reference} ({status}, {confirmation.get('reason', '-')})")
+            self.snapshot.invalidate()
+            with self._pending_lock:
+                for asset, (_, reference) in list(self.pending_orders.items()):
+                    if reference == deal_reference:
+                        del self.pending_orders[asset]
+        
+        # Kopie: parallele submit_order-Aufrufe hängen währenddessen an
+        for record in list(self.trade_history):
+            if record.get('deal_reference') == deal_reference:
+                record['deal_id'] = confirmation.get('dealId')
+                record['deal_status'] = status
+        self.journal.update_deal(deal_reference, confirmation.get('dealId'), status)
+        return confirmation
+    
+    def close_position(self, asset, deal_id, reason):
+        """Schließt eine Position per DELETE (Orders haben im Scheduler Vorrang vor Abfragen)"""
+        response = self.api_request("DELETE", f"/positions/{deal_id}")
+        if not response:
+            self.logger.error("❌ Schließen fehlgeschlagen: %s (Deal %s)", asset, deal_id)
+            self.metrics.inc('orders_total', result='close_failed')
+            return None
+        
+        self.logger.info("✅ Position geschlossen: %s (Deal %s, %s)", asset, deal_id, reason)
+        self.metrics.inc('orders_total', result='closed')
+        self.exit_engine.untrack(self.trading_assets[asset]['epic'])
+        
+        # Positionsstand sofort neu abgleichen statt auf den nächsten Takt zu warten
+        self.snapshot.invalidate()
+        if self.event_scheduler:
+            self.event_scheduler.trigger('positions')
+        return response
+    
+    def reserve_orders(self, select):
+        """Reserviert Slots für neue Orders - select(gehaltene Assets, freie Slots) wählt die Assets aus"""
+        with self._pending_lock:
+            now = self.clock()
+            for asset, (reserved_at, reference) in list(self.pending_orders.items()):
+                if now - reserved_at > self.pending_order_timeout:
+                    self.logger.warning("⚠️ Order für %s (%s) nicht im Positionsstand - Reservierung verfällt", asset, reference)
+                    del self.pending_orders[asset]
+            
+            held = set(self.open_positions) | set(self.pending_orders)
+            selected = select(held, self.max_open_trades - len(held))
+            for asset in selected:
+                self.pending_orders[asset] = (now, None)
+            return selected
+    
+    def release_order(self, asset):
+        """Gibt die Reservierung frei (Position eröffnet, Order abgelehnt oder nicht gesendet)"""
+        with self._pending_lock:
+            self.pending_orders.pop(asset, None)
+    
+    def record_trade(self, trade_record):
+        """Verbucht einen Fill im Speicher-Fenster und im Journal"""
+        self.trade_history.append(trade_record)
+        self.journal.record(trade_record)
+    
+    @timed('trade_seconds')
+    def execute_trade(self, asset, direction, current_price, stop_loss, take_profit):
+        """Führt einen Trade mit AI-Signalen aus"""
+        reserved = False
+        try:
+            # Offene und bereits gesendete Orders zählen gleich
+            if not self.reserve_orders(lambda held, free_slots: [asset] if asset not in held and free_slots > 0 else []):
+                # Prüfe ob bereits eine Position in diesem Asset existiert
+                if asset in self.open_positions or asset in self.pending_orders:
+                    self.logger.info("⏭️  Trade übersprungen: Bereits Position in %s", asset)
+                else:
+                    self.logger.info("⏭️  Trade übersprungen: Maximale Anzahl offener Trades (%d) erreicht", self.max_open_trades)
+                return None
+            reserved = True
+            
+            balance_eur, _, _, _ = self.get_account_balance()
+            if balance_eur <= 0:
+                self.logger.error("❌ Trade abgebrochen: Kein Guthaben verfügbar")
+                self.release_order(asset)
+                return None
+            
+            order = self.build_trade_payload(asset, direction, stop_loss, take_profit, balance_eur)
+            if not order:
+                self.release_order(asset)
+                return None
+            
+            response = self.submit_order(order)
+            if response:
+                self.dispatcher.confirm_async(response['dealReference'])
+                if self.event_scheduler:
+                    self.event_scheduler.trigger('positions')
+            return response
+                
+        except Exception as e:
+            if reserved:
+                self.release_order(asset)
+            self.logger.error(f"❌ Fehler beim AI Trade-Execution: {str(e)}")
+            return None
+    
+    def execute_ai_trading_strategy(self, signals=None):
+        """Führt AI-gesteuerte Trading-Strategie aus"""
+        if not self.auto_trading:
+            return
+        
+        balance_eur, balance_usd, available, profit_loss = self.get_account_balance()
+        if balance_eur <= 0:
+            return
+        
+        # Eine Analyse für alle Orders dieses Zyklus
+        if signals is None:
+            signals = self.enhanced_analyze_market()
+        
+        # Slots und Assets über alle Analyse-Aufgaben hinweg reservieren - offene und gesendete Orders zählen gleich
+        def select(held, free_slots):
+            # Startstrategie: Diversifikation bei kleinem Kapital
+            if balance_eur >= 30 and not held:
+                self.logger.info("🎯 AI-STRATEGIE: Starte diversifiziertes Portfolio mit verfügbarem Kapital")
+                
+                # Wähle 2-3 Assets zufällig aus
+                available_assets = [a for a in self.target_assets if a in signals]
+                target_positions = random.sample(available_assets, min(2, len(available_assets)))
+                candidates = [a for a in target_positions if signals[a]['signal'] in ['BUY', 'SELL']]
+            
+            # Fortlaufendes Trading basierend auf AI-Signalen
+            elif free_slots > 0:
+                candidates = [
+                    asset for asset, data in signals.items()
+                    if data['signal'] in ['BUY', 'SELL'] and
+                    asset not in held and
+                    data['position_value_eur'] >= self.min_position_eur
+                ]
+                # Stärkste Signale zuerst
+                candidates.sort(key=lambda asset: signals[asset]['confidence'], reverse=True)
+            else:
+                return []
+            return candidates[:free_slots]
+        
+        orders = []
+        for asset in self.reserve_orders(select):
+            data = signals[asset]
+            self.logger.info("🤖 AI-Signal: %s %s (Confidence: %s)", asset, data['signal'], data['confidence'])
+            self.logger.info("   📊 Grund: %s", data['reason'])
+            
+            order = self.build_trade_payload(asset, data['signal'], data['stop_loss'], data['take_profit'], balance_eur)
+            if order:
+                orders.append(order)
+            else:
+                self.release_order(asset)
+        
+        if orders:
+            self.dispatcher.dispatch(orders)
+            # Positionsstand sofort abgleichen, statt bis zum nächsten Takt mit veraltetem Stand zu handeln
+            if self.event_scheduler:
+                self.event_scheduler.trigger('positions')
+    
+    def monitor_market(self):
+        """Haupt-Monitoring Loop mit AI-Trading"""
+        self.logger.info("🚀 AI TRADING BOT GESTARTET")
+        self.logger.info(f"🔧 Auto-Trading: {self.auto_trading}")
+        self.logger.info(f"⚡ Krypto: {self.enable_crypto} | Rohstoffe: {self.enable_commodities}")
+        self.logger.info(f"🎯 Max. Trades: {self.max_open_trades} | Risiko: {self.risk_per_trade*100}%")
+        self.logger.info(f"🤖 AI Agent: DeepSeek - Autonomer Trading Modus")
+        
+        self.event_scheduler = self.create_scheduler()
+        self.event_scheduler.run(lambda: self.running)
+    
+    def create_scheduler(self):
+        """Konto, Positionen und Analyse pro Asset-Klasse auf eigenen Timern, dazu Kursbewegungs-Auslöser"""
+        scheduler = EventScheduler(self.logger, self.metrics, backoff_max=self.error_backoff_max)
+        scheduler.add_task('balance', lambda keys: self.refresh_balance(), self.balance_refresh_interval)
+        scheduler.add_task('positions', lambda keys: self.refresh_positions(), self.position_refresh_interval)
+        
+        cadences = {'crypto': self.crypto_check_interval, 'commodity': self.commodity_check_interval}
+        classes = {}
+        for asset in self.target_assets:
+            if asset in self.trading_assets:
+                classes.setdefault(self.trading_assets[asset]['type'], []).append(asset)
+        for asset_type, assets in classes.items():
+            scheduler.add_task(
+                asset_type,
+                lambda keys, assets=assets: self.analyze_and_trade(assets if keys is None else [a for a in assets if a in keys]),
+                cadences.get(asset_type, self.check_interval),
+                cooldown=1.0
+            )
+        
+        scheduler.add_task('fx', lambda keys: self.refresh_fx_rate(), self.fx_refresh_interval)
+        scheduler.add_task('instruments', lambda keys: self.load_instruments(), self.instrument_cache_ttl, delay=self.instrument_cache_ttl)
+        # Profiling nur der Analyse-Zyklen zählen, Konto/Positionen laufen mit
+        scheduler.profiler = self.profiler
+        self.profiler.cycle_tasks = set(classes)
+        if self.profile_trigger_file:
+            scheduler.add_task('profile', lambda keys: self.profiler.check_trigger(self.profile_trigger_file, self.profile_cycles), 5.0)
+        if self.state_store:
+            scheduler.add_task('state', lambda keys: self.save_state(), self.state_interval, delay=self.state_interval)
+        
+        # Die Timer aktualisieren Konto und Positionen selbst - der Snapshot lebt bis dahin
+        self.snapshot.ttl = max(self.account_cache_ttl, self.balance_refresh_interval, self.position_refresh_interval)
+        
+        self._move_reference = {}
+        if self.move_trigger_percent > 0:
+            self.quotes.add_listener(self.on_quote_move)
+        return scheduler
+    
+    def on_quote_move(self, epic, quote):
+        """Quote-Listener: löst die Analyse aus, wenn sich der Kurs seit der letzten Analyse stark bewegt"""
+        asset = self.epic_index.get(epic)
+        if asset is None:
+            return
+        mid = (quote[0] + quote[1]) / 2
+        reference = self._move_reference.get(epic)
+        if reference is None:
+            self._move_reference[epic] = mid
+        elif abs(mid - reference) >= reference * self.move_trigger_percent:
+            self._move_reference[epic] = mid
+            self.logger.info("⚡ Kursbewegung %s: %.4f → %.4f - Analyse ausgelöst", asset, reference, mid)
+            self.event_scheduler.trigger(self.trading_assets[asset]['type'], asset)
+    
+    def refresh_balance(self):
+        """Timer-Aufgabe: Depotwert neu laden (Fehler lösen den Backoff aus)"""
+        self.snapshot.invalidate('account')
+        if self.async_client:
+            # ASYNC_API: Konto und Positionen in einem parallelen Abruf, der Positions-Timer ist damit erledigt
+            self.snapshot.invalidate('positions')
+            self.async_client.prefetch_cycle(quotes=False)
+            if self.get_open_positions() is not None and self.event_scheduler:
+                self.event_scheduler.postpone('positions')
+        if self.snapshot.get('account', self._load_account) is None:
+            raise RuntimeError("Depotdaten nicht verfügbar")
+    
+    def refresh_positions(self):
+        """Timer-Aufgabe: Positionen neu laden und abgleichen"""
+        self.snapshot.invalidate('positions')
+        if self.async_client:
+            self.snapshot.invalidate('account')
+            self.async_client.prefetch_cycle(quotes=False)
+            if self.snapshot.get('account', self._load_account) is not None and self.event_scheduler:
+                self.event_scheduler.postpone('balance')
+        if self.get_open_positions() is None:
+            raise RuntimeError("Positionen nicht verfügbar")
+    
+    def save_state(self):
+        """Schreibt Positionen, letzte Analyse, Trade-Fenster und Kerzenpuffer atomar auf Platte"""
+        candles = {}
+        for epic, buffer in list(self.candles.buffers.items()):
+            if buffer.count:
+                candles[epic] = (buffer.window().copy(), list(buffer.current) if buffer.current else None)
+        
+        history = []
+        for record in list(self.trade_history):
+            record = dict(record)
+            if isinstance(record.get('timestamp'), datetime):
+                record['timestamp'] = record['timestamp'].isoformat()
+            history.append(record)
+        
+        self.state_store.save({
+            'open_positions': {asset: dict(position) for asset, position in list(self.open_positions.items())},
+            'last_analysis': dict(self.last_analysis),
+            'trade_history': history,
+            'exits': self.exit_engine.export()
+        }, candles)
+    
+    def restore_state(self):
+        """Lädt den letzten Snapshot - Positionen werden danach mit dem Broker abgeglichen"""
+        loaded = self.state_store.load(self.state_max_age)
+        if loaded is None:
+            return False
+        state, candles = loaded
+        
+        # In-place: der Reconciler arbeitet auf demselben dict
+        self.open_positions.clear()
+        self.open_positions.update(state.get('open_positions', {}))
+        self.last_analysis = state.get('last_analysis', {})
+        
+        # Trailing-/Break-Even-Stand der Positionen weiterführen
+        if self.exit_engine.enabled:
+            exits = state.get('exits', {})
+            for asset, position in self.open_positions.items():
+                self.exit_engine.track(asset, position, **exits.get(asset, {}))
+        
+        # Das Journal ist maßgeblich - der Snapshot füllt nur ohne Journal auf
+        if not self.trade_history:
+            for record in state.get('trade_history', []):
+                if isinstance(record.get('timestamp'), str):
+                    record['timestamp'] = datetime.fromisoformat(record['timestamp'])
+                self.trade_history.append(record)
+        
+        # Kerzen zurückschreiben, Indikatoren laufen dabei über die Historie nach
+        restored = 0
+        for epic, (bars, current) in candles.items():
+            if self.candles.buffer(epic).count == 0:
+                self.candles.restore(epic, bars, current)
+                restored += len(bars)
+        
+        self.logger.info("♻️ Zustand wiederhergestellt: %d Positionen, %d Kerzen für %d Epics (Stand: %s)",
+                         len(self.open_positions), restored, len(candles),
+                         datetime.fromtimestamp(state['saved_at']).strftime("%H:%M:%S"))
+        return True
+    
+    def run_cycle(self, cycle):
+        """Ein AI Trading Zyklus: Depot, Positionen, Analyse, Trading"""
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("=" * 70)
+            self.logger.info("🔄 AI Trading Zyklus #%d - %s", cycle, datetime.fromtimestamp(self.clock()).strftime("%H:%M:%S"))
+        
+        # Jeder Zyklus startet mit einem frischen Snapshot
+        self.snapshot.invalidate()
+        if self.async_client:
+            self.async_client.prefetch_cycle()
+        
+        # 1. Depotwert abrufen
+        self.get_account_balance()
+        
+        # 2. Offene Positionen aktualisieren
+        self.get_open_positions()
+        
+        # 3.-6. Analyse und Trading
+        self.analyze_and_trade()
+    
+    def analyze_and_trade(self, assets=None):
+        """Analyse und Trading für alle oder einen Teil der Assets auf Basis des aktuellen Snapshots"""
+        if assets is not None and not assets:
+            return
+        self.analysis_count += 1
+        if assets is not None and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("=" * 70)
+            self.logger.info("🔄 AI Analyse #%d - %s: %s", self.analysis_count, datetime.fromtimestamp(self.clock()).strftime("%H:%M:%S"), ", ".join(assets))
+        
+        balance_eur, balance_usd, available, profit_loss = self.get_account_balance()
+        
+        # 3. AI-Marktanalyse durchführen
+        signals = self.enhanced_analyze_market(assets)
+        if assets is None:
+            self.last_analysis = signals
+        else:
+            self.last_analysis.update(signals)
+        
+        # Bewegungs-Auslöser messen ab dem zuletzt analysierten Kurs
+        if self._move_reference is not None:
+            for asset, data in signals.items():
+                if data['price']:
+                    self._move_reference[self.trading_assets[asset]['epic']] = data['price']
+        
+        # 4. AI-Trading-Signale anzeigen (kompakt als ein strukturiertes Event)
+        if self.event_logger:
+            self.log_event('signals', cycle=self.analysis_count, signals={
+                asset: [data['signal'], data['price'], data['confidence'], data['stop_loss'], data['take_profit']]
+                for asset, data in signals.items() if data['signal'] != 'HOLD'
+            })
+        elif self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("🎯 AI TRADING SIGNALE:")
+            
+            for asset, data in signals.items():
+                if data['signal'] != 'HOLD':
+                    signal_icon = "🟢" if data['signal'] == 'BUY' else "🔴" if data['signal'] == 'SELL' else "🟡"
+                    self.logger.info(f"   {signal_icon} {asset:8} | ${data['price']:8.2f} | {data['signal']:4} | Confidence: {data['confidence']}")
+                    self.logger.info(f"      📊 {data['reason']}")
+                    self.logger.info(f"      🎯 TP: ${data['take_profit']:.2f} | 🛑 SL: ${data['stop_loss']:.2f}")
+        
+        # 5. AI-TRADING: Trades ausführen (nur mit bekanntem Konto- und Positionsstand)
+        if self.auto_trading and not self.positions_synced:
+            self.logger.warning("⏭️  AI AUTO-TRADING ausgesetzt: Positionsstand unbekannt")
+        elif self.auto_trading and balance_eur > 0:
+            self.logger.info("🤖 AI AUTO-TRADING AKTIV - Prüfe Trade-Möglichkeiten...")
+            self.execute_ai_trading_strategy(signals)
+        
+        self.metrics.set('last_cycle_timestamp', round(time.time(), 3))
+        self.metrics.set('open_positions', len(self.open_positions))
+        
+        # 6. Risikomanagement-Info
+        risk_eur = balance_eur * self.risk_per_trade
+        risk_usd = balance_usd * self.risk_per_trade
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("📊 AI ZUSAMMENFASSUNG:")
+            self.logger.info(f"   Offene Trades: {len(self.open_positions)}/{self.max_open_trades}")
+            self.logger.info(f"   Risiko pro Trade: €{risk_eur:,.2f} (${risk_usd:,.2f})")
+            self.logger.info(f"   Gesamt Trades: {self.journal.total}")
+    
+    def start(self):
+        """Startet den AI Bot"""
+        self.logger.info("🤖 Starte AI Trading Bot...")
+        
+        try:
+            self.launch()
+            install_profile_signal([self])
+            
+            while self.running:
+                time.sleep(1)
+                
+        except KeyboardInterrupt:
+            self.stop()
+        except Exception as e:
+            self.logger.error(f"❌ Kritischer Fehler: {str(e)}")
+            self.stop()
+    
+    def launch(self):
+        """Startet Feed, Metriken und Trading-Thread ohne zu blockieren"""
+        # Warmstart aus dem letzten Snapshot
+        if self.state_store:
+            try:
+                self.restore_state()
+            except Exception as e:
+                self.logger.warning("⚠️ Zustands-Snapshot nicht lesbar, Kaltstart: %s", e)
+        
+        # Instrument-Daten aus dem Cache, nur Fehlendes vom Broker
+        self.load_instruments()
+        
+        # Initialer Kontostand-Check
+        balance_eur, _, _, _ = self.get_account_balance()
+        self.logger.info(f"💰 Startkapital: €{balance_eur:,.2f}")
+        self.logger.info("🎯 AI-Strategie: Diversifiziertes Portfolio mit 15% Risikomanagement")
+        
+        # Wiederhergestellte Positionen sofort mit dem Broker abgleichen
+        self.get_open_positions()
+        
+        # Kurs-Feed starten (im Mehrkonten-Betrieb betreibt ihn der Host)
+        if self.hub is None:
+            self.quote_feed = QuoteFeed(self.create_quote_transport(), self.quotes, self.logger)
+            self.quote_feed.start()
+        
+        # Metriken für Alerting (Zyklusdauer, Broker-Latenz)
+        if self.metrics_port:
+            port = self.metrics.serve(self.metrics_port)
+            self.logger.info("📈 Metriken unter http://127.0.0.1:%d/metrics", port)
+        if self.metrics_file:
+            self.metrics.start_snapshots(self.metrics_file, self.metrics_interval, self.logger)
+            self.logger.info("📈 Metrik-Snapshot alle %.0fs: %s", self.metrics_interval, self.metrics_file)
+        
+        monitor_thread = threading.Thread(target=self.monitor_market, name=f"monitor-{self.name or 'bot'}")
+        monitor_thread.daemon = True
+        monitor_thread.start()
+    
+    def stop(self):
+        """Stoppt den AI Bot"""
+        self.running = False
+        if self.event_scheduler:
+            self.event_scheduler.wake()
+        if self.quote_feed:
+            self.quote_feed.stop()
+        if self.metrics_file:
+            try:
+                self.metrics.write_snapshot(self.metrics_file)
+            except Exception as e:
+                self.logger.warning("⚠️ Metrik-Snapshot fehlgeschlagen: %s", e)
+        self.metrics.stop()
+        if self.state_store:
+            try:
+                self.save_state()
+            except Exception as e:
+                self.logger.warning("⚠️ Zustands-Snapshot fehlgeschlagen: %s", e)
+        self.logger.info("🛑 AI Trading Bot gestoppt")
+        self.logger.info(f"📈 AI Handels-Historie: {self.journal.total} Trades")
+        self.journal.close()
+
+class BotHost:
+    """Mehrere Bots (je Konto/Strategie eine .env-Datei) in einem Prozess auf gemeinsamen Marktdaten"""
+    def __init__(self, config_paths):
+        from dotenv import dotenv_values
+        
+        self.bots = []
+        envs = []
+        for index, path in enumerate(config_paths):
+            name = os.path.splitext(os.path.basename(path))[0].lstrip('.') or 'default'
+            values = {key: value for key, value in dotenv_values(path).items() if value is not None}
+            # Prozess-Umgebung als gemeinsame Basis, die Datei überschreibt pro Konto
+            env = {**os.environ, **values}
+            if 'TRADE_JOURNAL_PATH' not in values:
+                env['TRADE_JOURNAL_PATH'] = f"trade_journal_{name}.db"
+            if 'STATE_DIR' not in values and env.get('STATE_DIR', 'state'):
+                env['STATE_DIR'] = os.path.join(env.get('STATE_DIR', 'state'), name)
+            if 'PROFILE_DIR' not in values:
+                env['PROFILE_DIR'] = os.path.join(env.get('PROFILE_DIR', 'profiles'), name)
+            # Gemeinsamer Metrik-Port/-Datei: ein Port pro Konto ab dem Basisport, eine Datei pro Konto
+            if 'METRICS_PORT' not in values and int(env.get('METRICS_PORT', '0')):
+                env['METRICS_PORT'] = str(int(env['METRICS_PORT']) + index)
+            if 'METRICS_FILE' not in values and env.get('METRICS_FILE'):
+                root, extension = os.path.splitext(env['METRICS_FILE'])
+                env['METRICS_FILE'] = f"{root}_{name}{extension}"
+            envs.append((name, env))
+        
+        # Kerzen-Raster kommt aus der ersten Konfiguration und gilt für alle
+        base = envs[0][1]
+        self.hub = MarketDataHub(int(base.get('CANDLE_CAPACITY', '1440')), int(base.get('CANDLE_SECONDS', '60')))
+        for name, env in envs:
+            self.bots.append(AITradingBot(env, hub=self.hub, name=name))
+        self.logger = logging.getLogger('AITradingBot')
     
-    def calculate_position_size(self, balance_eur, asset_type, current_price):
-        """Berechnet Positionsgröße basierend auf Risiko und Preis"""
-        risk_amount_eur = balance_eur * self.risk_per_trade
+    def start(self):
+        """Startet alle Bots und den gemeinsamen Kurs-Feed, blockiert bis Strg+C"""
+        self.logger.info("🤖 Starte %d Bot-Instanzen: %s", len(self.bots), ", ".join(bot.name for bot in self.bots))
         
-        if asset_type == "crypto":
-            leverage = self.crypto_leverage
+        running = []
+        for bot in self.bots:
+            try:
+                bot.launch()
+                running.append(bot)
+            except Exception as e:
+                bot.logger.error(f"❌ Kritischer Fehler: {str(e)}")
+                bot.stop()
+        if not running:
+            raise RuntimeError("Keine Bot-Instanz gestartet")
+        
+        # Ein Feed für alle Epics aller Konten
+        epics = []
+        for bot in running:
+            for epic in bot.quote_epics():
+                if epic not in epics:
+                    epics.append(epic)
+        self.hub.start_feed(running[0].create_quote_transport(epics), self.logger)
+        install_profile_signal(running)
+        
+        try:
+            while any(bot.running for bot in running):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+    
+    def stop(self):
+        self.hub.stop()
+        for bot in self.bots:
+            if bot.running:
+                bot.stop()
+
+class MarketData:
+    """Historische Kerzen aller Epics als Arrays: timestamps (T), bars (Epics×T×OHLCV)"""
+    def __init__(self, timestamps, epics, bars):
+        self.timestamps = timestamps
+        self.epics = list(epics)
+        self.bars = bars
+    
+    @classmethod
+    def load(cls, path):
+        """Lädt CSV/Parquet (timestamp,epic,open,high,low,close[,volume]) oder einen .npz-Cache"""
+        if path.endswith('.npz'):
+            data = np.load(path)
+            return cls(data['timestamps'], [str(e) for e in data['epics']], data['bars'])
+        
+        if path.endswith('.parquet'):
+            import pandas as pd
+            frame = pd.read_parquet(path)
+            volume = frame['volume'] if 'volume' in frame else [0.0] * len(frame)
+            rows = zip(frame['timestamp'], frame['epic'], frame['open'], frame['high'], frame['low'], frame['close'], volume)
         else:
-            leverage = self.commodity_leverage
-            
-        # Positionsgröße in Basiswährung berechnen
-        position_value_eur = risk_amount_eur * leverage
-        position_size = position_value_eur / current_price
+            rows = cls._read_csv(path)
         
-        # Auf Lot-Größe anpassen
-        lot_size = self.trading_assets.get(asset_type, {}).get('lot_size', 1)
-        if lot_size > 0:
-            position_size = max(lot_size, (position_size // lot_size) * lot_size)
+        series = {}
+        for timestamp, epic, o, h, l, c, v in rows:
+            series.setdefault(str(epic), []).append((cls._parse_time(timestamp), float(o), float(h), float(l), float(c), float(v)))
         
-        return position_size, leverage, position_value_eur
+        epics = sorted(series)
+        values = {epic: np.array(series[epic]) for epic in epics}
+        timestamps = np.unique(np.concatenate([values[epic][:, 0] for epic in epics]))
+        bars = np.full((len(epics), len(timestamps), 5), np.nan)
+        for i, epic in enumerate(epics):
+            bars[i, np.searchsorted(timestamps, values[epic][:, 0])] = values[epic][:, 1:]
+        return cls(timestamps, epics, bars)
     
-    def enhanced_analyze_market(self):
-        """Erweiterte Marktanalyse mit AI-gesteuerten Signalen"""
-        signals = {}
-        balance_eur, _, _, _ = self.get_account_balance()
+    @staticmethod
+    def _read_csv(path):
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                yield row['timestamp'], row['epic'], row['open'], row['high'], row['low'], row['close'], row.get('volume') or 0
+    
+    @staticmethod
+    def _parse_time(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            if hasattr(value, 'timestamp'):
+                return value.timestamp()
+            return datetime.fromisoformat(str(value)).timestamp()
+    
+    def save(self, path):
+        """Speichert die Daten als .npz für schnelles Wiederladen"""
+        np.savez(path, timestamps=self.timestamps, epics=np.array(self.epics), bars=self.bars)
+
+class SimulatedBroker:
+    """In-Prozess-Broker für Backtests: füllt Orders, löst SL/TP aus und führt den Kontostand"""
+    # Epic → (Mindestgröße, Schrittweite, Margin in %)
+    DEALING_RULES = {
+        "BTCUSD": (0.01, 0.01, 50), "ETHUSD": (0.1, 0.1, 50), "SOLUSD": (1, 1, 50),
+        "XRPUSD": (100, 100, 50), "DOGEUSD": (1000, 1000, 50), "BNBUSD": (1, 1, 50),
+        "COPPER": (1, 1, 10), "NATGAS": (1, 1, 10)
+    }
+    
+    def __init__(self, balance, eur_usd_rate=1.08, spread=0.0):
+        self.balance = balance
+        self.eur_usd_rate = eur_usd_rate
+        self.spread = spread
+        self.prices = {}
+        self.positions = {}
+        self.closed_trades = []
+        self.confirms = {}
+        self.next_id = 1
+        self.time = 0.0
+    
+    def quote(self, epic):
+        price = self.prices[epic]
+        half = price * self.spread / 2
+        return price - half, price + half
+    
+    def request(self, method, endpoint, data=None):
+        """Beantwortet API-Requests wie api_request (None bei Fehlern)"""
+        path = endpoint.split('?')[0]
+        
+        if method == "GET" and path.startswith("/accounts/"):
+            profit = self.unrealized_eur()
+            return {'balance': self.balance, 'available': self.balance + profit, 'profitLoss': profit, 'currency': 'EUR'}
+        elif method == "GET" and path == "/positions":
+            return {'positions': [self._position_view(p) for p in self.positions.values()]}
+        elif method == "POST" and path == "/positions":
+            return self.open_position(data or {})
+        elif method == "DELETE" and path.startswith("/positions/"):
+            deal_id = path.rsplit('/', 1)[1]
+            return self.close_position(deal_id, None) if deal_id in self.positions else None
+        elif method == "GET" and path.startswith("/confirms/"):
+            return self.confirms.get(path.rsplit('/', 1)[1])
+        elif method == "GET" and path == "/markets":
+            # Handelsregeln stehen schon vor dem ersten Kurs fest (Instrument-Cache beim Start)
+            epics = endpoint.split('epics=', 1)[1].split(',') if 'epics=' in endpoint else list(self.prices)
+            return {'marketDetails': [self._market_view(epic) for epic in epics if epic in self.prices or epic in self.DEALING_RULES]}
+        elif method == "GET" and path.startswith("/markets/"):
+            epic = path.rsplit('/', 1)[1]
+            return self._market_view(epic) if epic in self.prices else None
+        return None
+    
+    def open_position(self, data):
+        epic = data.get('epic')
+        if epic not in self.prices or not data.get('size'):
+            return None
         
-        # Aktuelle Marktpreise (simuliert - würde durch echte API ersetzt)
-        asset_prices = {
-            "BTC": 69420, "ETH": 3500, "SOL": 145, "XRP": 0.58, 
-            "DOGE": 0.12, "BNB": 580, "KUPFER": 4.25, "GAS": 2.85
+        bid, ask = self.quote(epic)
+        deal_id = f"SIM{self.next_id}"
+        reference = f"REF{self.next_id}"
+        self.next_id += 1
+        
+        self.positions[deal_id] = {
+            'deal_id': deal_id,
+            'epic': epic,
+            'direction': data['direction'],
+            'size': float(data['size']),
+            'open_level': ask if data['direction'] == 'BUY' else bid,
+            'stop_level': data.get('stopLevel'),
+            'profit_level': data.get('profitLevel'),
+            'opened_at': self.time
         }
+        self.confirms[reference] = {'dealReference': reference, 'dealId': deal_id, 'dealStatus': 'ACCEPTED'}
+        return {'dealReference': reference}
+    
+    def close_position(self, deal_id, level):
+        """Schließt eine Position zum angegebenen Kurs (None = Marktkurs)"""
+        position = self.positions.pop(deal_id)
+        if level is None:
+            bid, ask = self.quote(position['epic'])
+            level = bid if position['direction'] == 'BUY' else ask
         
-        for asset in self.target_assets:
-            if asset not in self.trading_assets:
+        profit = self._profit_eur(position, level)
+        self.balance += profit
+        self.closed_trades.append({**position, 'close_level': level, 'closed_at': self.time, 'profit': profit})
+        return {'dealReference': f"CLOSE-{deal_id}"}
+    
+    def on_bar(self, epic, high, low, close):
+        """Aktualisiert den Kurs und prüft Stop-Loss/Take-Profit innerhalb der Kerze"""
+        self.prices[epic] = close
+        if not self.positions:
+            return
+        
+        for deal_id, position in list(self.positions.items()):
+            if position['epic'] != epic:
                 continue
-                
-            asset_info = self.trading_assets[asset]
-            current_price = asset_prices.get(asset, 1)
-            
-            # Berechne mögliche Positionsgröße
-            position_size, leverage, position_value = self.calculate_position_size(
-                balance_eur, asset_info['type'], current_price
-            )
+            stop, target = position['stop_level'], position['profit_level']
             
-            # Prüfe Mindestposition
-            if position_value < self.min_position_eur:
-                signals[asset] = {'signal': 'HOLD', 'price': current_price, 'reason': 'Position zu klein'}
+            # Konservativ: Stop-Loss vor Take-Profit, wenn beide in der Kerze liegen
+            if position['direction'] == 'BUY':
+                if stop and low <= stop:
+                    self.close_position(deal_id, stop)
+                elif target and high >= target:
+                    self.close_position(deal_id, target)
+            else:
+                if stop and high >= stop:
+                    self.close_position(deal_id, stop)
+                elif target and low <= target:
+                    self.close_position(deal_id, target)
+    
+    def _profit_eur(self, position, level):
+        sign = 1 if position['direction'] == 'BUY' else -1
+        return sign * (level - position['open_level']) * position['size'] / self.eur_usd_rate
+    
+    def unrealized_eur(self):
+        profit = 0.0
+        for position in self.positions.values():
+            bid, ask = self.quote(position['epic'])
+            profit += self._profit_eur(position, bid if position['direction'] == 'BUY' else ask)
+        return profit
+    
+    def equity(self):
+        return self.balance + self.unrealized_eur()
+    
+    def _market_view(self, epic):
+        min_size, step, margin_factor = self.DEALING_RULES.get(epic, (1, 1, 10))
+        view = {
+            'instrument': {'epic': epic, 'marginFactor': margin_factor, 'marginFactorUnit': 'PERCENTAGE'},
+            'dealingRules': {
+                'minDealSize': {'unit': 'POINTS', 'value': min_size},
+                'minSizeIncrement': {'unit': 'POINTS', 'value': step}
+            }
+        }
+        if epic in self.prices:
+            bid, offer = self.quote(epic)
+            view['snapshot'] = {'bid': bid, 'offer': offer}
+        return view
+    
+    def _position_view(self, position):
+        bid, ask = self.quote(position['epic'])
+        level = bid if position['direction'] == 'BUY' else ask
+        return {
+            'epic': position['epic'],
+            'position': {
+                'dealId': position['deal_id'],
+                'direction': position['direction'],
+                'size': position['size'],
+                'profit': round(self._profit_eur(position, level), 2),
+                'openLevel': position['open_level'],
+                'stopLevel': position['stop_level'],
+                'limitLevel': position['profit_level']
+            }
+        }
+
+class IndicatorPoint:
+    """Indikatorstand eines Epics zu einem Zeitpunkt - gleiche Schnittstelle wie IndicatorSet"""
+    __slots__ = ('count', 'values')
+    
+    def __init__(self, count, values):
+        self.count = count
+        self.values = values
+    
+    def features(self):
+        return self.values
+
+class HistoryIndicators:
+    """Indikatoren der ganzen Historie in einem NumPy-Durchlauf pro Epic - ersetzt IndicatorStore im Backtest"""
+    def __init__(self, data, ema_fast, ema_slow, rsi_period, atr_period):
+        self.epics = {epic: i for i, epic in enumerate(data.epics)}
+        valid = ~np.isnan(data.bars[:, :, 3])
+        
+        # Gültige Kerzen bis einschließlich t und ihre Zeilen pro Epic (NaN = keine Kerze)
+        self.counts = np.cumsum(valid, axis=1, dtype=np.int32)
+        self.rows = [np.flatnonzero(mask) for mask in valid]
+        self.values = []
+        for i, rows in enumerate(self.rows):
+            high, low, close = data.bars[i, rows, 1], data.bars[i, rows, 2], data.bars[i, rows, 3]
+            self.values.append(self.compute(high, low, close, ema_fast, ema_slow, rsi_period, atr_period))
+        self.cursor = 0
+    
+    @staticmethod
+    def ema(values, alpha):
+        """EMA-Verlauf (Start = erster Wert) als Präfix-Scan in log2(n) Array-Operationen statt Python-Schleife"""
+        result = alpha * values
+        if len(result):
+            result[0] = values[0]
+        decay, shift = 1 - alpha, 1
+        while shift < len(result):
+            factor = decay ** shift
+            if factor == 0:
+                break
+            result[shift:] += factor * result[:-shift]
+            shift *= 2
+        return result
+    
+    @classmethod
+    def compute(cls, high, low, close, ema_fast, ema_slow, rsi_period, atr_period):
+        """Merkmale nach jeder Kerze wie IndicatorSet.features, als Kerzen×4-Matrix"""
+        features = np.empty((len(close), 4))
+        features[:, 0] = cls.ema(close, 2 / (ema_fast + 1))
+        features[:, 1] = cls.ema(close, 2 / (ema_slow + 1))
+        
+        # Wilder-RSI und ATR ab der zweiten Kerze, davor die Startwerte von StreamingRSI/StreamingATR
+        delta = np.diff(close)
+        avg_gain = cls.ema(np.clip(delta, 0, None), 1 / rsi_period)
+        avg_loss = cls.ema(np.clip(-delta, 0, None), 1 / rsi_period)
+        total = avg_gain + avg_loss
+        features[:1, 2] = 50.0
+        features[1:, 2] = np.where(total > 0, 100 * avg_gain / np.where(total > 0, total, 1), 50.0)
+        
+        prev_close = close[:-1]
+        true_range = np.maximum(high[1:] - low[1:], np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)))
+        features[:1, 3] = 0.0
+        features[1:, 3] = cls.ema(true_range, 1 / atr_period)
+        return features
+    
+    def get(self, epic):
+        """Stand an der Kerze self.cursor (None = Epic ohne Daten)"""
+        i = self.epics.get(epic)
+        if i is None:
+            return None
+        count = int(self.counts[i, self.cursor])
+        return IndicatorPoint(count, tuple(self.values[i][count - 1].tolist()) if count else None)
+    
+    def signal_bars(self, engine, types, window):
+        """Epics×Kerzen-Maske der BUY/SELL-Signale (Zeilen wie self.epics) - ein Modellaufruf pro Epic"""
+        length = self.counts.shape[1]
+        active = np.zeros((len(self.epics), length), dtype=bool)
+        for epic, asset_type in types.items():
+            i = self.epics.get(epic)
+            if i is None or len(self.values[i]) < window:
                 continue
+            scores = engine.scores(self.values[i][window - 1:])
+            _, buy, sell = engine.directions([asset_type], scores)
+            
+            # Ein Stand gilt von seiner Kerze bis zur nächsten gültigen Kerze des Epics
+            signal = np.flatnonzero(buy | sell) + window - 1
+            rows = self.rows[i]
+            ends = np.append(rows[1:], length)
+            marks = np.zeros(length + 1, dtype=np.int32)
+            marks[rows[signal]] += 1
+            marks[ends[signal]] -= 1
+            active[i] = np.cumsum(marks[:length]) > 0
+        return active
+
+class Backtester:
+    """Spielt historische Kerzen durch enhanced_analyze_market → execute_ai_trading_strategy → execute_trade
+    
+    Indikatoren und Scores entstehen vorab für die ganze Historie. Der volle Zyklus läuft nur, wenn ein freies
+    Epic ein Signal hat oder sich der Positionsstand geändert hat; dazwischen werden nur SL/TP geprüft.
+    """
+    def __init__(self, bot, data, initial_balance=1000.0, spread=0.0):
+        self.bot = bot
+        self.data = data
+        self.broker = SimulatedBroker(initial_balance, bot.eur_usd_rate, spread)
+        self.now = float(data.timestamps[0]) if len(data.timestamps) else 0.0
+        
+        # Bot von HTTP-API und Wanduhr trennen
+        bot.broker = self.broker
+        bot.async_client = None
+        bot.dispatcher = OrderDispatcher(bot, 0)
+        bot.journal = TradeJournal(None, bot.logger)
+        bot.trade_history.clear()
+        bot.clock = lambda: self.now
+        bot.instruments = InstrumentStore(None, float('inf'), bot.logger)
+        bot.fx.update(self.broker.eur_usd_rate)
+        bot.fx.max_age = float('inf')
+        bot.load_instruments()
+        bot.logger.setLevel(logging.WARNING)
+        
+        # Indikatoren kommen aus der vorab berechneten Historie statt aus der Tick-Aggregation
+        bot.quotes.remove_listener(bot.candles.on_quote)
+        self.history = HistoryIndicators(data, bot.ema_fast, bot.ema_slow, bot.rsi_period, bot.atr_period)
+        bot.indicators = self.history
+        
+        # Deal-ID → [durchsuchte Zeilen, erste SL/TP-Zeile, nächste Suchlänge]
+        self._exits = {}
+        # Letzte an den QuoteCache gemeldete Zeile pro Epic - jeder Kurs erreicht die Listener nur einmal
+        self._quoted = [-1] * len(data.epics)
+    
+    def run(self):
+        """Führt den Backtest aus und liefert die Kennzahlen"""
+        bot, broker, data, history = self.bot, self.broker, self.data, self.history
+        initial_balance = broker.balance
+        timestamps = data.timestamps.tolist()
+        closes = data.bars[:, :, 3]
+        equity_curve = []
+        
+        # Zyklus-Kerzen wie im Live-Takt: erste Kerze ab next_cycle
+        cycles = []
+        next_cycle = self.now
+        for t, timestamp in enumerate(timestamps):
+            if timestamp >= next_cycle:
+                cycles.append(t)
+                next_cycle = timestamp + bot.check_interval
+        
+        traded = {asset: bot.trading_assets[asset]['epic'] for asset in bot.target_assets if asset in bot.trading_assets}
+        signal_bars = history.signal_bars(
+            bot.engine, {epic: bot.trading_assets[asset]['type'] for asset, epic in traded.items()}, bot.indicator_window)
+        
+        processed = 0
+        free = []
+        for cycle, t in enumerate(cycles, 1):
+            self._replay(processed, t)
+            processed = t + 1
+            self.now = broker.time = timestamps[t]
             
-            # AI-gesteuerte Signalanalyse
-            if asset_info['type'] == 'crypto':
-                signal_data = self.analyze_crypto_trend(asset, current_price)
+            # Voller Zyklus nur, wenn die Strategie handeln könnte: Signal auf einem freien Asset oder neuer Positionsstand
+            held = {position['deal_id'] for position in bot.open_positions.values()}
+            if (cycle == 1 or bot.pending_orders or not bot.positions_synced or held != broker.positions.keys()
+                    or any(signal_bars[i, t] for i in free)):
+                self._sync_quotes(t)
+                history.cursor = t
+                bot.run_cycle(cycle)
+                free = self._free_epics(traded)
             else:
-                signal_data = self.analyze_commodity_trend(asset, current_price)
+                self._skip_cycle(len(traded))
             
-            signals[asset] = {
-                'signal': signal_data['direction'],
-                'price': current_price,
-                'type': asset_info['type'],
-                'leverage': leverage,
-                'position_size': position_size,
-                'position_value_eur': position_value,
-                'stop_loss': signal_data['stop_loss'],
-                'take_profit': signal_data['take_profit'],
-                'confidence': signal_data['confidence'],
-                'reason': signal_data['reason']
-            }
+            for position in broker.positions.values():
+                i = history.epics[position['epic']]
+                count = history.counts[i, t]
+                broker.prices[position['epic']] = closes[i, history.rows[i][count - 1]]
+            equity_curve.append(broker.equity())
         
-        return signals
+        # SL/TP nach dem letzten Zyklus zählen zu den Trades, nicht mehr zur Equity-Kurve
+        self._replay(processed, len(timestamps) - 1)
+        return self.report(initial_balance, equity_curve)
     
-    def analyze_crypto_trend(self, asset, current_price):
-        """AI-Analyse für Krypto-Trends"""
-        # Simulierte AI-Analyse (ersetzbar durch echte ML-Modelle)
-        trend_score = random.uniform(0, 1)
-        
-        if trend_score > 0.6:
-            direction = 'BUY'
-            stop_loss = current_price * (1 - self.stop_loss_percent)
-            take_profit = current_price * (1 + self.take_profit_percent)
-            confidence = trend_score
-            reason = "Bullisches Momentum erkannt"
-        elif trend_score < 0.4:
-            direction = 'SELL'
-            stop_loss = current_price * (1 + self.stop_loss_percent)
-            take_profit = current_price * (1 - self.take_profit_percent)
-            confidence = 1 - trend_score
-            reason = "Bearisches Momentum erkannt"
-        else:
-            direction = 'HOLD'
-            stop_loss = take_profit = current_price
-            confidence = 0.5
-            reason = "Seitwärtsmarkt - abwarten"
+    def _sync_quotes(self, t):
+        """Broker-Kurse und QuoteCache auf die letzte gültige Kerze jedes Epics bis t setzen"""
+        history, broker = self.history, self.broker
+        for epic, i in history.epics.items():
+            count = history.counts[i, t]
+            if not count:
+                continue
+            row = int(history.rows[i][count - 1])
+            broker.prices[epic] = float(self.data.bars[i, row, 3])
+            if row > self._quoted[i]:
+                self._quoted[i] = row
+                bid, ask = broker.quote(epic)
+                self.bot.quotes.update(epic, bid, ask, float(self.data.timestamps[row]))
+    
+    def _free_epics(self, traded):
+        """Zeilen der Epics, für die die Strategie neue Orders senden darf (freie Slots, Asset nicht gehalten)"""
+        bot = self.bot
+        held = set(bot.open_positions) | set(bot.pending_orders)
+        if len(held) >= bot.max_open_trades:
+            return []
+        return [self.history.epics[epic] for asset, epic in traded.items() if asset not in held and epic in self.history.epics]
+    
+    def _skip_cycle(self, traded):
+        """Zyklus ohne handelbares Signal und ohne Positionsänderung: nur die Zufallsauswahl der Startstrategie nachziehen"""
+        bot = self.bot
+        if bot.auto_trading and self.broker.balance >= 30 and not bot.open_positions and not bot.pending_orders:
+            random.sample(range(traded), min(2, traded))
+    
+    def _replay(self, start, end):
+        """Kerzen start..end (inklusive) zwischen zwei Zyklen: SL/TP der offenen Positionen, Exits der ExitEngine"""
+        if start > end:
+            return
+        broker, history = self.broker, self.history
+        stepped = self.bot.exit_engine.enabled
+        epics = {position['epic'] for position in broker.positions.values()}
+        if stepped:
+            epics.update(self.bot.exit_engine.slots)
         
-        return {
-            'direction': direction,
-            'stop_loss': round(stop_loss, 4),
-            'take_profit': round(take_profit, 4),
-            'confidence': round(confidence, 2),
-            'reason': reason
-        }
+        for epic in sorted(epics & history.epics.keys(), key=history.epics.get):
+            i = history.epics[epic]
+            first = int(history.counts[i, start - 1]) if start else 0
+            last = int(history.counts[i, end])
+            if first == last:
+                continue
+            if stepped:
+                self._step(epic, i, first, last)
+                continue
+            
+            # Ohne ExitEngine ändert sich bis zum ersten SL/TP-Treffer nichts
+            while True:
+                hits = [self._exit_row(i, position, first, last) for position in broker.positions.values() if position['epic'] == epic]
+                hits = [row for row in hits if row is not None and row < last]
+                if not hits:
+                    break
+                first = min(hits)
+                self._bar(epic, i, history.rows[i][first])
+                first += 1
     
-    def analyze_commodity_trend(self, asset, current_price):
-        """AI-Analyse für Rohstoff-Trends"""
-        # Konservativere Analyse für Rohstoffe
-        trend_score = random.uniform(0, 1)
-        
-        if trend_score > 0.65:
-            direction = 'BUY'
-            stop_loss = current_price * (1 - self.stop_loss_percent * 0.8)  # Engerer Stop
-            take_profit = current_price * (1 + self.take_profit_percent * 0.8)
-            confidence = trend_score
-            reason = "Stabile Aufwärtstrend bei Rohstoffen"
-        elif trend_score < 0.35:
-            direction = 'SELL' 
-            stop_loss = current_price * (1 + self.stop_loss_percent * 0.8)
-            take_profit = current_price * (1 - self.take_profit_percent * 0.8)
-            confidence = 1 - trend_score
-            reason = "Abwärtstrend bei Rohstoffen"
-        else:
-            direction = 'HOLD'
-            stop_loss = take_profit = current_price
-            confidence = 0.5
-            reason = "Stabile Seitwärtsphase"
+    def _step(self, epic, i, first, last):
+        """Kerze für Kerze wie im Live-Takt - die ExitEngine braucht jeden Kurs"""
+        bot, broker = self.bot, self.broker
+        for row in self.history.rows[i][first:last].tolist():
+            self._bar(epic, i, row)
+            self._quoted[i] = row
+            bid, ask = broker.quote(epic)
+            bot.quotes.update(epic, bid, ask, self.now)
+    
+    def _bar(self, epic, i, row):
+        o, h, l, c, v = self.data.bars[i, row].tolist()
+        self.now = self.broker.time = float(self.data.timestamps[row])
+        self.broker.on_bar(epic, h, l, c)
+    
+    def _exit_row(self, i, position, first, last):
+        """Erste Zeile ab first, in der SL/TP der Position greift - sucht bis mindestens last in wachsenden Blöcken, pro Deal gemerkt"""
+        search = self._exits.get(position['deal_id'])
+        if search is None:
+            search = self._exits[position['deal_id']] = [first, None, 1024]
+        rows = self.history.rows[i]
+        
+        while search[1] is None and search[0] < last:
+            until = min(len(rows), search[0] + search[2])
+            block = rows[search[0]:until]
+            high, low = self.data.bars[i, block, 1], self.data.bars[i, block, 2]
+            stop, target = position['stop_level'], position['profit_level']
+            hit = np.zeros(len(block), dtype=bool)
+            if position['direction'] == 'BUY':
+                if stop:
+                    hit |= low <= stop
+                if target:
+                    hit |= high >= target
+            else:
+                if stop:
+                    hit |= high >= stop
+                if target:
+                    hit |= low <= target
+            found = np.flatnonzero(hit)
+            if len(found):
+                search[1] = search[0] + int(found[0])
+            search[0] = until
+            search[2] *= 4
+        return search[1]
+    
+    def report(self, initial_balance, equity_curve):
+        """Kennzahlen: P&L, maximaler Drawdown, Anzahl Trades, Trefferquote"""
+        equity = np.array(equity_curve or [initial_balance])
+        peak = np.maximum.accumulate(np.maximum(equity, initial_balance))
+        profits = [trade['profit'] for trade in self.broker.closed_trades]
         
         return {
-            'direction': direction,
-            'stop_loss': round(stop_loss, 4),
-            'take_profit': round(take_profit, 4),
-            'confidence': round(confidence, 2),
-            'reason': reason
+            'initial_balance': initial_balance,
+            'final_equity': float(equity[-1]),
+            'pnl': float(equity[-1] - initial_balance),
+            'max_drawdown': float(np.max((peak - equity) / peak)),
+            'trades': len(profits),
+            'win_rate': sum(p > 0 for p in profits) / len(profits) if profits else 0.0,
+            'open_positions': len(self.broker.positions)
         }
+
+def run_trade_report(args):
+    """Report-Modus: python continuous_bot.py trades --asset BTC --since 2026-01-01"""
+    if not os.path.exists(args.journal):
+        raise FileNotFoundError(f"Kein Trade-Journal: {args.journal}")
     
-    def execute_trade(self, asset, direction, current_price, stop_loss, take_profit):
-        """Führt einen Trade mit AI-Signalen aus"""
+    journal = TradeJournal(args.journal, logging.getLogger('AITradingBot'))
+    since = datetime.fromisoformat(args.since) if args.since else None
+    until = datetime.fromisoformat(args.until) if args.until else None
+    trades = journal.query(args.asset, since, until, args.limit)
+    journal.close()
+    
+    print(f"📈 {len(trades)} Trades")
+    for trade in trades:
+        print(f"   {trade['timestamp']:%Y-%m-%d %H:%M:%S} | {trade['asset']:8} | {trade['direction']:4} | "
+              f"Size: {trade['size']:8.2f} | ${trade['price']:10.4f} | {trade['deal_status'] or '-'}")
+
+def run_backtest(args):
+    """Backtest-Modus: python continuous_bot.py backtest <daten>"""
+    data = MarketData.load(args.data)
+    random.seed(args.seed)
+    os.environ['TRADE_JOURNAL_PATH'] = ''
+    os.environ['STATE_DIR'] = ''
+    
+    started = time.perf_counter()
+    bot = AITradingBot()
+    result = Backtester(bot, data, args.balance, args.spread).run()
+    elapsed = time.perf_counter() - started
+    
+    print(f"📊 Backtest: {len(data.timestamps)} Kerzen × {len(data.epics)} Epics in {elapsed:.1f}s")
+    print(f"   💰 Start: €{result['initial_balance']:,.2f} | Ende: €{result['final_equity']:,.2f} | P&L: €{result['pnl']:,.2f}")
+    print(f"   📉 Max. Drawdown: {result['max_drawdown']*100:.1f}% | Trades: {result['trades']} | Trefferquote: {result['win_rate']*100:.0f}%")
+
+# Parameter, die load_config aus der Umgebung liest und die der Optimierer variieren darf
+SWEEP_PARAMETERS = ('CRYPTO_LEVERAGE', 'COMMODITY_LEVERAGE', 'RISK_PER_TRADE',
+                    'STOP_LOSS_PERCENT', 'TAKE_PROFIT_PERCENT', 'MAX_OPEN_TRADES')
+
+_sweep_data = None
+
+def _attach_sweep_data(names, shapes, epics):
+    """Worker-Initialisierung: Kursdaten aus Shared Memory einblenden (ohne Kopie)"""
+    global _sweep_data
+    
+    arrays = []
+    segments = []
+    for name, shape in zip(names, shapes):
+        segment = shared_memory.SharedMemory(name=name)
+        segments.append(segment)
+        arrays.append(np.ndarray(shape, dtype=np.float64, buffer=segment.buf))
+    
+    _sweep_data = (MarketData(arrays[0], epics, arrays[1]), segments)
+
+def _run_sweep_job(params, start, end, balance, seed):
+    """Ein Backtest-Lauf im Worker mit den Parametern als Umgebungsvariablen"""
+    data, _ = _sweep_data
+    os.environ.update({key: str(value) for key, value in params.items()})
+    os.environ['TRADE_JOURNAL_PATH'] = ''
+    os.environ['STATE_DIR'] = ''
+    random.seed(seed)
+    
+    bot = AITradingBot()
+    window = MarketData(data.timestamps[start:end], data.epics, data.bars[:, start:end])
+    result = Backtester(bot, window, balance).run()
+    return params, start, end, result
+
+class ParameterSweep:
+    """Grid-/Random-Search mit Walk-Forward über einen Prozess-Pool"""
+    def __init__(self, data, grid, samples=0, folds=0, balance=1000.0, workers=None, seed=42):
+        self.data = data
+        self.grid = grid
+        self.samples = samples
+        self.folds = folds
+        self.balance = balance
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+    
+    def parameter_sets(self):
+        """Alle Kombinationen des Grids oder eine zufällige Auswahl daraus"""
+        keys = list(self.grid)
+        combos = [dict(zip(keys, values)) for values in itertools.product(*(self.grid[k] for k in keys))]
+        if self.samples and self.samples < len(combos):
+            combos = random.Random(self.seed).sample(combos, self.samples)
+        return combos
+    
+    def segments(self):
+        """Zeitabschnitte für Walk-Forward (Training i, Test i+1)"""
+        bounds = np.linspace(0, len(self.data.timestamps), self.folds + 2).astype(int)
+        return list(zip(bounds[:-1], bounds[1:]))
+    
+    def run(self):
+        # Kursdaten einmal in Shared Memory legen statt sie an jeden Worker zu pickeln
+        arrays = [np.ascontiguousarray(self.data.timestamps, dtype=np.float64),
+                  np.ascontiguousarray(self.data.bars, dtype=np.float64)]
+        segments = []
         try:
-            # Prüfe ob bereits eine Position in diesem Asset existiert
-            if asset in self.open_positions:
-                self.logger.info(f"⏭️  Trade übersprungen: Bereits Position in {asset}")
-                return None
-            
-            # Prüfe maximale Anzahl offener Trades
-            if len(self.open_positions) >= self.max_open_trades:
-                self.logger.info(f"⏭️  Trade übersprungen: Maximale Anzahl offener Trades ({self.max_open_trades}) erreicht")
-                return None
-            
-            balance_eur, _, _, _ = self.get_account_balance()
-            if balance_eur <= 0:
-                self.logger.error("❌ Trade abgebrochen: Kein Guthaben verfügbar")
-                return None
-            
-            asset_info = self.trading_assets.get(asset)
-            if not asset_info:
-                self.logger.error(f"❌ Unbekanntes Asset: {asset}")
-                return None
-            
-            # Positionsgröße berechnen
-            position_size, leverage, position_value = self.calculate_position_size(
-                balance_eur, asset_info['type'], current_price
-            )
+            for array in arrays:
+                segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=np.float64, buffer=segment.buf)[...] = array
+                segments.append(segment)
             
-            # Trade-Daten vorbereiten
-            trade_data = {
-                "epic": asset_info['epic'],
-                "expiry": "-",
-                "direction": direction,
-                "size": position_size,
-                "orderType": "MARKET",
-                "timeInForce": "FILL_OR_KILL",
-                "level": current_price,
-                "guaranteedStop": False,
-                "stopLevel": stop_loss,
-                "stopDistance": 0,
-                "trailingStop": False,
-                "profitLevel": take_profit,
-                "profitDistance": 0,
-                "currencyCode": "USD"
-            }
-            
-            self.logger.info(f"🎯 AI EXECUTING TRADE: {asset} {direction}")
-            self.logger.info(f"   📏 Size: {position_size} | Leverage: {leverage}:1")
-            self.logger.info(f"   💰 Value: €{position_value:,.2f}")
-            self.logger.info(f"   🛑 Stop-Loss: {stop_loss:.4f}")
-            self.logger.info(f"   🎯 Take-Profit: {take_profit:.4f}")
+            ranges = [(0, len(self.data.timestamps))]
+            if self.folds:
+                ranges += self.segments()
             
-            # Trade ausführen
-            response = self.api_request("POST", "/positions", trade_data)
+            jobs = [(params, start, end) for params in self.parameter_sets() for start, end in ranges]
+            initargs = ([s.name for s in segments], [a.shape for a in arrays], self.data.epics)
             
-            if response and 'dealReference' in response:
-                self.logger.info(f"✅ AI TRADE ERFOLGREICH: Deal Reference: {response['dealReference']}")
-                
-                # Trade zur History hinzufügen
-                trade_record = {
-                    'timestamp': datetime.now(),
-                    'asset': asset,
-                    'direction': direction,
-                    'size': position_size,
-                    'price': current_price,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'deal_reference': response['dealReference'],
-                    'leverage': leverage
-                }
-                self.trade_history.append(trade_record)
-                
-                return response
-            else:
-                self.logger.error(f"❌ AI TRADE FEHLGESCHLAGEN: {response}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"❌ Fehler beim AI Trade-Execution: {str(e)}")
-            return None
+            with ProcessPoolExecutor(self.workers, initializer=_attach_sweep_data, initargs=initargs) as pool:
+                futures = [pool.submit(_run_sweep_job, params, int(start), int(end), self.balance, self.seed)
+                           for params, start, end in jobs]
+                results = [future.result() for future in futures]
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+        
+        full = [(params, result) for params, start, end, result in results if (start, end) == ranges[0]]
+        full.sort(key=lambda item: item[1]['pnl'], reverse=True)
+        return full, self.walk_forward(results) if self.folds else []
     
-    def execute_ai_trading_strategy(self):
-        """Führt AI-gesteuerte Trading-Strategie aus"""
-        if not self.auto_trading:
-            return
+    def walk_forward(self, results):
+        """Bestes Parameter-Set je Trainingsabschnitt, bewertet auf dem folgenden Abschnitt"""
+        by_range = {}
+        for params, start, end, result in results:
+            by_range.setdefault((start, end), []).append((params, result))
         
-        balance_eur, balance_usd, available, profit_loss = self.get_account_balance()
+        segments = self.segments()
+        report = []
+        for train, test in zip(segments[:-1], segments[1:]):
+            best_params, best_train = max(by_range[train], key=lambda item: item[1]['pnl'])
+            test_result = next(result for params, result in by_range[test] if params == best_params)
+            report.append({'train_range': train, 'test_range': test, 'params': best_params,
+                           'train_pnl': best_train['pnl'], 'test_result': test_result})
+        return report
+
+def run_sweep(args):
+    """Optimierer-Modus: python continuous_bot.py sweep <daten> --grid RISK_PER_TRADE=0.05,0.1 ..."""
+    grid = {}
+    for item in args.grid:
+        key, values = item.split('=', 1)
+        key = key.strip().upper()
+        if key not in SWEEP_PARAMETERS:
+            raise ValueError(f"Unbekannter Parameter: {key} (erlaubt: {', '.join(SWEEP_PARAMETERS)})")
+        grid[key] = [v.strip() for v in values.split(',') if v.strip()]
+    
+    data = MarketData.load(args.data)
+    sweep = ParameterSweep(data, grid, args.samples, args.folds, args.balance, args.workers, args.seed)
+    
+    started = time.perf_counter()
+    full, walk_forward = sweep.run()
+    print(f"📊 Parameter-Sweep: {len(full)} Sets auf {sweep.workers} Kernen in {time.perf_counter() - started:.1f}s")
+    
+    for params, result in full:
+        settings = " ".join(f"{k}={v}" for k, v in params.items())
+        print(f"   P&L: €{result['pnl']:10,.2f} | DD: {result['max_drawdown']*100:5.1f}% | Trades: {result['trades']:4} | {settings}")
+    
+    if walk_forward:
+        print("🔁 Walk-Forward:")
+        for fold in walk_forward:
+            settings = " ".join(f"{k}={v}" for k, v in fold['params'].items())
+            test, (start, end) = fold['test_result'], fold['test_range']
+            print(f"   Kerzen {start}-{end} | Train P&L: €{fold['train_pnl']:10,.2f} | Test P&L: €{test['pnl']:10,.2f} | "
+                  f"DD: {test['max_drawdown']*100:5.1f}% | Trades: {test['trades']:4} | {settings}")
+
+class MockCapitalServer:
+    """Lokaler Capital.com-Ersatz mit einstellbarer Latenz, Fehlerquote und 429-Antworten"""
+    START_PRICES = {
+        "BTCUSD": 69420, "ETHUSD": 3500, "SOLUSD": 145, "XRPUSD": 0.58,
+        "DOGEUSD": 0.12, "BNBUSD": 580, "COPPER": 4.25, "NATGAS": 2.85, "EURUSD": 1.08
+    }
+    
+    def __init__(self, port=0, latency=0.02, error_rate=0.0, rate_limit_rate=0.0, balance=1000.0, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.status_counts = {}
+        
+        # Kontostand, Positionen und Fills wie im Backtest
+        self.broker = SimulatedBroker(balance, spread=0.0005)
+        self.broker.prices.update(self.START_PRICES)
         
-        # Startstrategie: Diversifikation bei kleinem Kapital
-        if balance_eur >= 30 and len(self.open_positions) == 0:
-            self.logger.info("🎯 AI-STRATEGIE: Starte diversifiziertes Portfolio mit verfügbarem Kapital")
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = None
+    
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+    
+    def _handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self, "GET")
             
-            # Wähle 2-3 Assets zufällig aus
-            available_assets = [a for a in self.target_assets if a not in self.open_positions]
-            if available_assets:
-                target_positions = random.sample(available_assets, min(2, len(available_assets)))
-                
-                for asset in target_positions:
-                    signals = self.enhanced_analyze_market()
-                    if asset in signals and signals[asset]['signal'] in ['BUY', 'SELL']:
-                        self.execute_trade(
-                            asset, 
-                            signals[asset]['signal'], 
-                            signals[asset]['price'],
-                            signals[asset]['stop_loss'],
-                            signals[asset]['take_profit']
-                        )
-                        time.sleep(2)
-        
-        # Fortlaufendes Trading basierend auf AI-Signalen
-        elif len(self.open_positions) < self.max_open_trades:
-            signals = self.enhanced_analyze_market()
+            def do_POST(self):
+                server.handle(self, "POST")
             
-            trades_executed = 0
-            for asset, data in signals.items():
-                if (data['signal'] in ['BUY', 'SELL'] and 
-                    asset not in self.open_positions and
-                    data['position_value_eur'] >= self.min_position_eur and
-                    trades_executed < 1):
-                    
-                    self.logger.info(f"🤖 AI-Signal: {asset} {data['signal']} (Confidence: {data['confidence']})")
-                    self.logger.info(f"   📊 Grund: {data['reason']}")
-                    
-                    result = self.execute_trade(
-                        asset, 
-                        data['signal'], 
-                        data['price'],
-                        data['stop_loss'],
-                        data['take_profit']
-                    )
-                    if result:
-                        trades_executed += 1
-                        time.sleep(2)
+            def do_DELETE(self):
+                server.handle(self, "DELETE")
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
     
-    def monitor_market(self):
-        """Haupt-Monitoring Loop mit AI-Trading"""
-        self.logger.info("🚀 AI TRADING BOT GESTARTET")
-        self.logger.info(f"🔧 Auto-Trading: {self.auto_trading}")
-        self.logger.info(f"⚡ Krypto: {self.enable_crypto} | Rohstoffe: {self.enable_commodities}")
-        self.logger.info(f"🎯 Max. Trades: {self.max_open_trades} | Risiko: {self.risk_per_trade*100}%")
-        self.logger.info(f"🤖 AI Agent: DeepSeek - Autonomer Trading Modus")
+    def handle(self, handler, method):
+        """Beantwortet einen Request nach Latenz, Fehler- und Rate-Limit-Würfel"""
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b""
         
-        cycle = 0
+        with self.lock:
+            self.request_count += 1
+            roll = self.random.random()
+            delay = self.latency * self.random.uniform(0.5, 1.5)
+        time.sleep(delay)
         
-        while self.running:
-            try:
-                cycle += 1
-                current_time = datetime.now().strftime("%H:%M:%S")
-                
-                self.logger.info("=" * 70)
-                self.logger.info(f"🔄 AI Trading Zyklus #{cycle} - {current_time}")
-                
-                # 1. Depotwert abrufen
-                balance_eur, balance_usd, available, profit_loss = self.get_account_balance()
-                
-                # 2. Offene Positionen aktualisieren
-                self.get_open_positions()
-                
-                # 3. AI-Marktanalyse durchführen
-                signals = self.enhanced_analyze_market()
-                self.last_analysis = signals
-                
-                # 4. AI-Trading-Signale anzeigen
-                self.logger.info("🎯 AI TRADING SIGNALE:")
-                
-                for asset, data in signals.items():
-                    if data['signal'] != 'HOLD':
-                        signal_icon = "🟢" if data['signal'] == 'BUY' else "🔴" if data['signal'] == 'SELL' else "🟡"
-                        self.logger.info(f"   {signal_icon} {asset:8} | ${data['price']:8.2f} | {data['signal']:4} | Confidence: {data['confidence']}")
-                        self.logger.info(f"      📊 {data['reason']}")
-                        self.logger.info(f"      🎯 TP: ${data['take_profit']:.2f} | 🛑 SL: ${data['stop_loss']:.2f}")
-                
-                # 5. AI-TRADING: Trades ausführen
-                if self.auto_trading and balance_eur > 0:
-                    self.logger.info("🤖 AI AUTO-TRADING AKTIV - Prüfe Trade-Möglichkeiten...")
-                    self.execute_ai_trading_strategy()
-                
-                # 6. Risikomanagement-Info
-                risk_eur = balance_eur * self.risk_per_trade
-                risk_usd = balance_usd * self.risk_per_trade
-                
-                self.logger.info("📊 AI ZUSAMMENFASSUNG:")
-                self.logger.info(f"   Offene Trades: {len(self.open_positions)}/{self.max_open_trades}")
-                self.logger.info(f"   Risiko pro Trade: €{risk_eur:,.2f} (${risk_usd:,.2f})")
-                self.logger.info(f"   Gesamt Trades: {len(self.trade_history)}")
-                
-                self.logger.info(f"⏰ Nächster AI-Handels-Zyklus in {self.check_interval} Sekunden...")
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                self.logger.error(f"❌ Fehler in AI Trading-Zyklus: {str(e)}")
-                time.sleep(30)
+        if roll < self.rate_limit_rate:
+            return self._respond(handler, 429, {"errorCode": "error.too-many.requests"}, {"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            return self._respond(handler, 500, {"errorCode": "error.internal"})
+        
+        endpoint = handler.path[len("/api/v1"):] if handler.path.startswith("/api/v1") else None
+        data = json.loads(body) if body else None
+        
+        # DELETE /positions mit dealId im Body auf /positions/{dealId} abbilden
+        if method == "DELETE" and endpoint == "/positions" and data and 'dealId' in data:
+            endpoint = f"/positions/{data['dealId']}"
+        
+        with self.lock:
+            self._move_prices()
+            response = self.broker.request(method, endpoint, data) if endpoint else None
+        
+        if response is None:
+            return self._respond(handler, 404, {"errorCode": "error.not-found"})
+        self._respond(handler, 200, response)
+    
+    def _move_prices(self):
+        for epic, price in self.broker.prices.items():
+            self.broker.prices[epic] = price * (1 + self.random.gauss(0, 0.0005))
+    
+    def _respond(self, handler, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        with self.lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(body)
     
     def start(self):
-        """Startet den AI Bot"""
-        self.logger.info("🤖 Starte AI Trading Bot...")
-        
-        try:
-            # Initialer Kontostand-Check
-            balance_eur, _, _, _ = self.get_account_balance()
-            self.logger.info(f"💰 Startkapital: €{balance_eur:,.2f}")
-            self.logger.info("🎯 AI-Strategie: Diversifiziertes Portfolio mit 15% Risikomanagement")
-            
-            monitor_thread = threading.Thread(target=self.monitor_market)
-            monitor_thread.daemon = True
-            monitor_thread.start()
-            
-            while self.running:
-                time.sleep(1)
-                
-        except KeyboardInterrupt:
-            self.stop()
-        except Exception as e:
-            self.logger.error(f"❌ Kritischer Fehler: {str(e)}")
-            self.stop()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='mock-capital', daemon=True)
+        self.thread.start()
+        return self
     
     def stop(self):
-        """Stoppt den AI Bot"""
-        self.running = False
-        self.logger.info("🛑 AI Trading Bot gestoppt")
-        self.logger.info(f"📈 AI Handels-Historie: {len(self.trade_history)} Trades")
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class CycleBenchmark:
+    """Misst monitor_market-Zyklen von AITradingBot gegen den lokalen Mock-Server"""
+    # Periodische Wartung gehört nicht zum gemessenen Zyklus
+    MAINTENANCE_TASKS = ('fx', 'instruments', 'profile', 'state')
+    
+    def __init__(self, server, cycles=50, warmup=5, verbose=False):
+        self.server = server
+        self.cycles = cycles
+        self.warmup = warmup
+        
+        os.environ['API_BASE_URL'] = server.base_url
+        os.environ.setdefault('ACCOUNT_ID', 'benchmark')
+        os.environ['TRADE_JOURNAL_PATH'] = ''
+        os.environ['STATE_DIR'] = ''
+        # Zyklen laufen direkt hintereinander - das Broker-Limit würde die Messung dominieren
+        os.environ.setdefault('API_RATE_LIMIT', '1000')
+        os.environ.setdefault('API_BURST', '100')
+        self.bot = AITradingBot()
+        if not verbose:
+            self.bot.logger.setLevel(logging.WARNING)
+        self._seed_history()
+        
+        # Dieselben Scheduler-Aufgaben wie im Live-Betrieb: Konto, Positionen, Analyse pro Asset-Klasse
+        self.scheduler = self.bot.event_scheduler = self.bot.create_scheduler()
+        for name in self.MAINTENANCE_TASKS:
+            self.scheduler.tasks.pop(name, None)
+    
+    def _seed_history(self):
+        """Kurshistorie vorbelegen, damit die Analyse vollständig läuft"""
+        now = time.time()
+        rng = random.Random(1)
+        for epic, price in self.server.broker.prices.items():
+            for i in range(self.bot.indicator_window + 1):
+                price *= 1 + rng.gauss(0, 0.002)
+                timestamp = now - (self.bot.indicator_window + 1 - i) * self.bot.candle_seconds
+                self.bot.candles.add_bar(epic, (timestamp, price, price * 1.001, price * 0.999, price, 1.0))
+    
+    def _refresh_quotes(self):
+        """Kurse wie vom Stream - ohne HTTP, damit nur die Zyklus-Requests zählen"""
+        with self.server.lock:
+            prices = dict(self.server.broker.prices)
+        for epic, price in prices.items():
+            self.bot.quotes.update(epic, price * 0.99975, price * 1.00025)
+    
+    def _cycle(self, cycle):
+        self._refresh_quotes()
+        # Ein Zyklus = alle Aufgaben einmal fällig
+        for task in self.scheduler.tasks.values():
+            task['due'] = 0.0
+            task['blocked_until'] = 0.0
+        requests_before = self.server.request_count
+        started = time.perf_counter()
+        self.scheduler.run_pending()
+        return time.perf_counter() - started, self.server.request_count - requests_before
+    
+    def run(self):
+        for cycle in range(1, self.warmup + 1):
+            self._cycle(cycle)
+        
+        durations, request_counts = [], []
+        for cycle in range(self.warmup + 1, self.warmup + self.cycles + 1):
+            duration, count = self._cycle(cycle)
+            durations.append(duration)
+            request_counts.append(count)
+        
+        # Allokationen in einem eigenen Durchlauf - tracemalloc verfälscht die Zeiten
+        tracemalloc.start()
+        peaks = []
+        baseline, _ = tracemalloc.get_traced_memory()
+        for cycle in range(self.warmup + self.cycles + 1, self.warmup + 2 * self.cycles + 1):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            self._cycle(cycle)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+        growth = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        
+        durations = np.array(durations) * 1000
+        return {
+            'cycles': self.cycles,
+            'p50_ms': float(np.percentile(durations, 50)),
+            'p99_ms': float(np.percentile(durations, 99)),
+            'mean_ms': float(durations.mean()),
+            'requests_per_cycle': float(np.mean(request_counts)),
+            'peak_alloc_kib': float(np.mean(peaks) / 1024),
+            'retained_kib': growth / 1024,
+            'task_errors': sum(value for (name, _), value in self.bot.metrics.counters.items() if name == 'cycle_errors_total'),
+            'status_counts': dict(self.server.status_counts)
+        }
+
+def run_host(args):
+    """Mehrkonten-Modus: python continuous_bot.py host konten/a.env konten/b.env"""
+    BotHost(args.configs).start()
+
+def run_mock_server(args):
+    """Mock-Modus: python continuous_bot.py mockserver --port 8800"""
+    server = MockCapitalServer(args.port, args.latency, args.error_rate, args.rate_limit, args.balance).start()
+    print(f"🧪 Mock Capital.com API läuft auf {server.base_url} (API_BASE_URL)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+def run_benchmark(args):
+    """Benchmark-Modus: python continuous_bot.py benchmark --cycles 50"""
+    server = MockCapitalServer(0, args.latency, args.error_rate, args.rate_limit, args.balance, seed=args.seed).start()
+    random.seed(args.seed)
+    try:
+        result = CycleBenchmark(server, args.cycles, verbose=args.verbose).run()
+    finally:
+        server.stop()
+    
+    print(f"⏱️  Zyklus-Benchmark ({result['cycles']} Zyklen, Latenz {args.latency*1000:.0f} ms):")
+    print(f"   p50: {result['p50_ms']:.1f} ms | p99: {result['p99_ms']:.1f} ms | Mittel: {result['mean_ms']:.1f} ms")
+    print(f"   Requests/Zyklus: {result['requests_per_cycle']:.1f} | Allokation/Zyklus: {result['peak_alloc_kib']:.1f} KiB | Zuwachs: {result['retained_kib']:.1f} KiB")
+    print(f"   HTTP-Status: {result['status_counts']} | Aufgaben-Fehler: {result['task_errors']}")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(result, f, indent=2)
+    
+    # Regression gegenüber einer gespeicherten Referenz melden
+    if args.compare:
+        with open(args.compare) as f:
+            reference = json.load(f)
+        regressions = [key for key in ('p50_ms', 'p99_ms', 'requests_per_cycle', 'peak_alloc_kib')
+                       if result[key] > reference[key] * (1 + args.tolerance)]
+        if regressions:
+            print(f"❌ Regression gegenüber {args.compare}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"✅ Keine Regression gegenüber {args.compare}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI Trading Bot")
+    commands = parser.add_subparsers(dest='command')
+    
+    backtest = commands.add_parser('backtest', help="Historische Kerzen mit simuliertem Broker durchspielen")
+    backtest.add_argument('data', help="CSV/Parquet (timestamp,epic,open,high,low,close[,volume]) oder .npz")
+    backtest.add_argument('--balance', type=float, default=1000.0, help="Startkapital in EUR")
+    backtest.add_argument('--spread', type=float, default=0.0, help="Spread als Anteil des Kurses")
+    backtest.add_argument('--seed', type=int, default=42)
+    
+    sweep = commands.add_parser('sweep', help="Parameter-Sweep mit Walk-Forward über alle Kerne")
+    sweep.add_argument('data', help="CSV/Parquet (timestamp,epic,open,high,low,close[,volume]) oder .npz")
+    sweep.add_argument('--grid', action='append', default=[], metavar='PARAM=W1,W2', help="Werte pro Parameter")
+    sweep.add_argument('--samples', type=int, default=0, help="Zufällige Auswahl statt vollem Grid")
+    sweep.add_argument('--folds', type=int, default=0, help="Anzahl Walk-Forward-Abschnitte")
+    sweep.add_argument('--balance', type=float, default=1000.0, help="Startkapital in EUR")
+    sweep.add_argument('--workers', type=int, default=None)
+    sweep.add_argument('--seed', type=int, default=42)
+    
+    for name, help_text in (('mockserver', "Lokalen Capital.com-Ersatz starten"),
+                            ('benchmark', "Zyklus-Latenz gegen den Mock-Server messen")):
+        mock = commands.add_parser(name, help=help_text)
+        mock.add_argument('--latency', type=float, default=0.02, help="Antwortzeit in Sekunden")
+        mock.add_argument('--error-rate', type=float, default=0.0, help="Anteil 500-Antworten")
+        mock.add_argument('--rate-limit', type=float, default=0.0, help="Anteil 429-Antworten")
+        mock.add_argument('--balance', type=float, default=1000.0, help="Startkapital in EUR")
+    commands.choices['mockserver'].add_argument('--port', type=int, default=8800)
+    benchmark = commands.choices['benchmark']
+    benchmark.add_argument('--cycles', type=int, default=50)
+    benchmark.add_argument('--seed', type=int, default=42)
+    benchmark.add_argument('--verbose', action='store_true', help="Bot-Logging mitmessen")
+    benchmark.add_argument('--save', help="Ergebnis als JSON speichern")
+    benchmark.add_argument('--compare', help="Mit gespeichertem Ergebnis vergleichen")
+    benchmark.add_argument('--tolerance', type=float, default=0.2, help="Erlaubte Verschlechterung")
+    
+    host = commands.add_parser('host', help="Mehrere Konten/Strategien mit gemeinsamen Marktdaten betreiben")
+    host.add_argument('configs', nargs='+', help=".env-Datei pro Bot-Instanz")
+    
+    trades = commands.add_parser('trades', help="Trades aus dem Journal abfragen")
+    trades.add_argument('--journal', default=os.getenv('TRADE_JOURNAL_PATH', 'trade_journal.db'))
+    trades.add_argument('--asset')
+    trades.add_argument('--since', help="ISO-Datum/Zeit, z.B. 2026-01-01")
+    trades.add_argument('--until', help="ISO-Datum/Zeit (exklusiv)")
+    trades.add_argument('--limit', type=int)
+    
+    args = parser.parse_args()
+    
     try:
-        bot = AITradingBot()
-        bot.start()
+        if args.command == 'backtest':
+            run_backtest(args)
+        elif args.command == 'sweep':
+            run_sweep(args)
+        elif args.command == 'trades':
+            run_trade_report(args)
+        elif args.command == 'host':
+            run_host(args)
+        elif args.command == 'mockserver':
+            run_mock_server(args)
+        elif args.command == 'benchmark':
+            run_benchmark(args)
+        else:
+            bot = AITradingBot()
+            bot.start()
     except Exception as e:
         print(f"❌ AI Bot konnte nicht gestartet werden: {str(e)}")
         sys.exit(1)
@@ -26,6 +26,11 @@ case "$1" in
         echo "⚙️ Öffne Konfiguration..."
         nano /opt/trading-bot/.env
         ;;
+    profile)
+        echo "🔬 Profiling für die nächsten Zyklen aktivieren..."
+        sudo systemctl kill --kill-who=main -s USR1 trading-bot
+        echo "   Ergebnis in /opt/trading-bot/profiles/ (profile-*.pstats und profile-*.txt)"
+        ;;
     update)
         echo "📥 Aktualisiere Bot..."
         cd /opt/trading-bot
@@ -33,12 +38,13 @@ case "$1" in
         sudo systemctl restart trading-bot
         ;;
     *)
-        echo "Verwendung: $0 {start|stop|status|logs|restart|config|update}"
+        echo "Verwendung: $0 {start|stop|status|logs|restart|config|profile|update}"
         echo ""
         echo "Beispiele:"
         echo "  $0 start    - Bot starten"
         echo "  $0 logs     - Logs anzeigen" 
         echo "  $0 config   - Konfiguration bearbeiten"
+        echo "  $0 profile  - Laufenden Bot profilieren"
         echo "  $0 update   - Bot aktualisieren"
         exit 1
 esac
@@ -0,0 +1,104 @@
+"""Trailing-Stop, Break-Even, Haltedauer und Slot-Wiederverwendung der ExitEngine"""
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from continuous_bot import ExitEngine
+
+
+def position(epic, direction='BUY', open_level=100.0, stop_level=None, deal_id=None):
+    return {'epic': epic, 'direction': direction, 'open_level': open_level,
+            'stop_level': stop_level, 'deal_id': deal_id or f"DEAL-{epic}", 'size': 1}
+
+
+def make_engine(**settings):
+    closed = []
+    engine = ExitEngine(lambda asset, deal_id, reason: closed.append((asset, deal_id, reason)),
+                        logging.getLogger('test'), clock=lambda: 0.0, **settings)
+    return engine, closed
+
+
+def quote(price, ts=1.0):
+    return (price, price, ts)
+
+
+def test_trailing_stop_follows_best_price_and_closes():
+    engine, closed = make_engine(trailing_percent=0.02)
+    engine.track('BTC', position('BTCUSD'))
+
+    engine.on_quote('BTCUSD', quote(110.0))
+    assert engine.state[engine.slots['BTCUSD'], ExitEngine.STOP] == pytest.approx(107.8)
+    engine.on_quote('BTCUSD', quote(108.0))
+    assert closed == []
+
+    engine.on_quote('BTCUSD', quote(107.5))
+    assert closed == [('BTC', 'DEAL-BTCUSD', 'Trailing-Stop')]
+
+
+def test_trailing_stop_for_short_position():
+    engine, closed = make_engine(trailing_percent=0.02)
+    engine.track('GOLD', position('GOLD', direction='SELL'))
+
+    engine.on_quote('GOLD', quote(90.0))
+    assert engine.state[engine.slots['GOLD'], ExitEngine.STOP] == pytest.approx(91.8)
+    engine.on_quote('GOLD', quote(92.0))
+    assert closed == [('GOLD', 'DEAL-GOLD', 'Trailing-Stop')]
+
+
+def test_break_even_moves_stop_to_entry():
+    engine, closed = make_engine(break_even_percent=0.01)
+    engine.track('BTC', position('BTCUSD', stop_level=95.0))
+
+    engine.on_quote('BTCUSD', quote(100.5))
+    assert engine.state[engine.slots['BTCUSD'], ExitEngine.STOP] == 95.0
+    engine.on_quote('BTCUSD', quote(101.0))
+    assert engine.state[engine.slots['BTCUSD'], ExitEngine.STOP] == 100.0
+
+    engine.on_quote('BTCUSD', quote(99.9))
+    assert closed == [('BTC', 'DEAL-BTCUSD', 'Break-Even')]
+
+
+def test_broker_stop_without_trailing_is_labelled_stop_loss():
+    engine, closed = make_engine(max_hold_seconds=3600)
+    engine.track('BTC', position('BTCUSD', stop_level=95.0))
+
+    engine.on_quote('BTCUSD', quote(94.0))
+    assert closed == [('BTC', 'DEAL-BTCUSD', 'Stop-Loss')]
+
+
+def test_max_hold_time_closes_once_until_retry():
+    engine, closed = make_engine(max_hold_seconds=60)
+    engine.track('BTC', position('BTCUSD'))
+
+    engine.on_quote('BTCUSD', quote(100.0, ts=30.0))
+    assert closed == []
+    engine.on_quote('BTCUSD', quote(100.0, ts=61.0))
+    engine.on_quote('BTCUSD', quote(100.0, ts=62.0))
+    assert closed == [('BTC', 'DEAL-BTCUSD', 'Haltedauer')]
+
+
+def test_reused_slot_ignores_quotes_of_previous_epic():
+    engine, closed = make_engine(trailing_percent=0.02)
+    engine.track('BTC', position('BTCUSD'))
+    slot = engine.slots['BTCUSD']
+    engine.untrack('BTCUSD')
+    engine.track('GOLD', position('GOLD', open_level=2000.0))
+    assert engine.slots['GOLD'] == slot
+
+    # Veraltete Zuordnung wie bei einem Lookup vor untrack/track
+    engine.slots['BTCUSD'] = slot
+    engine.on_quote('BTCUSD', quote(50.0))
+
+    assert closed == []
+    assert engine.state[slot, ExitEngine.BEST] == 2000.0
+    assert engine.state[slot, ExitEngine.STOP] == -float('inf')
+
+
+def test_export_keeps_state_per_asset():
+    engine, _ = make_engine(trailing_percent=0.02)
+    engine.track('BTC', position('BTCUSD'), best=120.0, stop=117.6, opened_at=5.0)
+    assert engine.export() == {'BTC': {'best': 120.0, 'stop': 117.6, 'opened_at': 5.0}}
@@ -0,0 +1,68 @@
+"""Laufende Indikatoren müssen der Batch-Berechnung über dasselbe Fenster entsprechen"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from continuous_bot import CandleBuffer, HistoryIndicators, IndicatorSet, MarketData, RollingStats, SignalEngine
+
+EMA_FAST, EMA_SLOW, RSI_PERIOD, ATR_PERIOD, WINDOW = 12, 26, 14, 14, 60
+
+
+def random_bars(length, seed=42):
+    """Zufallspfad als OHLCV-Kerzen [timestamp, open, high, low, close, volume]"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, length)) * close
+    bars = np.empty((length, 6))
+    bars[:, CandleBuffer.TIMESTAMP] = np.arange(length) * 60.0
+    bars[:, CandleBuffer.OPEN] = open_
+    bars[:, CandleBuffer.HIGH] = np.maximum(open_, close) + spread
+    bars[:, CandleBuffer.LOW] = np.minimum(open_, close) - spread
+    bars[:, CandleBuffer.CLOSE] = close
+    bars[:, CandleBuffer.VOLUME] = rng.integers(1, 100, length)
+    return bars
+
+
+@pytest.mark.parametrize('seed', [1, 7, 42])
+def test_streaming_features_match_batch(seed):
+    bars = random_bars(WINDOW, seed)
+    indicators = IndicatorSet(EMA_FAST, EMA_SLOW, RSI_PERIOD, ATR_PERIOD, WINDOW)
+    for bar in bars:
+        indicators.update(bar)
+
+    engine = SignalEngine(EMA_FAST, EMA_SLOW, RSI_PERIOD, ATR_PERIOD)
+    expected = engine.features(bars[np.newaxis])[0]
+
+    np.testing.assert_allclose(indicators.features(), expected, rtol=1e-9)
+
+
+def test_rolling_stats_match_window():
+    closes = random_bars(500)[:, CandleBuffer.CLOSE]
+    stats = RollingStats(WINDOW)
+    for i, close in enumerate(closes, 1):
+        stats.update(close)
+        window = closes[max(0, i - WINDOW):i]
+        assert stats.mean == pytest.approx(window.mean(), rel=1e-9)
+        if len(window) > 1:
+            assert stats.variance == pytest.approx(window.var(ddof=1), rel=1e-6)
+
+
+def test_history_indicators_match_streaming_per_bar():
+    bars = random_bars(300)
+    bars[40:45, CandleBuffer.CLOSE] = np.nan
+    data = MarketData(bars[:, CandleBuffer.TIMESTAMP], ['BTCUSD'], bars[np.newaxis, :, CandleBuffer.OPEN:])
+    history = HistoryIndicators(data, EMA_FAST, EMA_SLOW, RSI_PERIOD, ATR_PERIOD)
+
+    indicators = IndicatorSet(EMA_FAST, EMA_SLOW, RSI_PERIOD, ATR_PERIOD, WINDOW)
+    for t, bar in enumerate(bars):
+        if not np.isnan(bar[CandleBuffer.CLOSE]):
+            indicators.update(bar)
+        history.cursor = t
+        point = history.get('BTCUSD')
+        assert point.count == indicators.count
+        np.testing.assert_allclose(point.features(), indicators.features(), rtol=1e-9)
@@ -0,0 +1,45 @@
+"""Fehler beim Senden einer Order dürfen dispatch nicht verlassen und geben die Reservierung frei"""
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from continuous_bot import OrderDispatcher
+
+
+class StubBot:
+    def __init__(self, failing):
+        self.failing = failing
+        self.logger = logging.getLogger('test')
+        self.released = []
+        self.confirmed = []
+
+    def submit_order(self, order):
+        if order['asset'] in self.failing:
+            raise RuntimeError(f"Broker weg: {order['asset']}")
+        return {'dealReference': f"ref-{order['asset']}"}
+
+    def confirm_deal(self, deal_reference):
+        self.confirmed.append(deal_reference)
+
+    def release_order(self, asset):
+        self.released.append(asset)
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_dispatch_survives_failing_submit(workers):
+    bot = StubBot(failing={'GOLD'})
+    dispatcher = OrderDispatcher(bot, workers)
+    try:
+        responses = dispatcher.dispatch([{'asset': 'GOLD'}, {'asset': 'BTC'}])
+    finally:
+        dispatcher.close()
+        if dispatcher.executor:
+            dispatcher.executor.shutdown(wait=True)
+
+    assert responses == [None, {'dealReference': 'ref-BTC'}]
+    assert bot.released == ['GOLD']
+    assert bot.confirmed == ['ref-BTC']